@@ -50,21 +50,25 @@ class FindingsAnalyzer:
         grouped = []
         seen = set()
         
+        # Normalize each description once instead of on every comparison
+        texts = [self._normalize(finding.get('description', '')) for finding in findings]
+        word_sets = [set(text.split()) for text in texts]
+        
         for i, finding in enumerate(findings):
             if i in seen:
                 continue
             
             desc = finding.get('description', '')
+            text, words = texts[i], word_sets[i]
             similar = [finding]
             
             # Find similar findings
-            for j, other in enumerate(findings[i+1:], i+1):
+            for j in range(i + 1, len(findings)):
                 if j in seen:
                     continue
                 
-                other_desc = other.get('description', '')
-                if self._are_similar(desc, other_desc):
-                    similar.append(other)
+                if self._normalized_similar(text, words, texts[j], word_sets[j]):
+                    similar.append(findings[j])
                     seen.add(j)
             
             if len(similar) > 1:
@@ -77,12 +81,19 @@ class FindingsAnalyzer:
         
         return grouped
     
+    def _normalize(self, text: str) -> str:
+        """Normalize text for similarity comparison."""
+        return text.lower().strip()
+    
     def _are_similar(self, text1: str, text2: str) -> bool:
         """Check if two texts are similar (simple implementation)."""
         # Normalize texts
-        text1 = text1.lower().strip()
-        text2 = text2.lower().strip()
-        
+        text1 = self._normalize(text1)
+        text2 = self._normalize(text2)
+        return self._normalized_similar(text1, set(text1.split()), text2, set(text2.split()))
+    
+    def _normalized_similar(self, text1: str, words1: set, text2: str, words2: set) -> bool:
+        """Compare two normalized texts given their word sets."""
         # Exact match
         if text1 == text2:
             return True
@@ -92,9 +103,6 @@ class FindingsAnalyzer:
             return True
         
         # Check word overlap (simple similarity)
-        words1 = set(text1.split())
-        words2 = set(text2.split())
-        
         if not words1 or not words2:
             return False
         
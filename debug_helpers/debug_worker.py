@@ -15,6 +15,7 @@ from pathlib import Path
 from typing import Dict, Any, Optional, Callable
 from datetime import datetime
 from multiprocessing import Process, Queue, Event
+from multiprocessing.connection import Connection
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
@@ -405,11 +406,17 @@ class DebugWorker:
 
 def run_worker(worker_id: str, scenario: TestScenario,
                result_queue: Queue, status_queue: Queue,
-               shutdown_event: Event, env: Dict[str, str]):
+               shutdown_event: Event, env: Dict[str, str],
+               done_conn: Optional[Connection] = None):
     """Entry point for worker process."""
-    worker = DebugWorker(worker_id, scenario, result_queue, 
-                        status_queue, shutdown_event, env)
-    worker.run()
+    try:
+        worker = DebugWorker(worker_id, scenario, result_queue, 
+                            status_queue, shutdown_event, env)
+        worker.run()
+    finally:
+        # Notify the orchestrator so it doesn't have to poll for completion
+        if done_conn is not None:
+            done_conn.send(("done", worker_id))
 
 
 # Test worker functionality
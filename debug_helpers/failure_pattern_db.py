@@ -85,6 +85,7 @@ class FailurePatternDB:
         self.patterns: Dict[str, FailurePattern] = {}
         self.pattern_index: Dict[str, List[str]] = defaultdict(list)  # Error type to pattern IDs
         self.session_solutions: Dict[str, List[str]] = defaultdict(list)  # Session ID to pattern IDs
+        self._defer_saves = False  # Set during bulk imports; the caller saves once at the end
         self._load_database()
     
     def _load_database(self):
@@ -149,6 +150,11 @@ class FailurePatternDB:
         with open(self.db_path, 'w') as f:
             json.dump(data, f, indent=2)
     
+    def _autosave(self):
+        """Save after a change, unless saves are deferred for a bulk import."""
+        if not self._defer_saves:
+            self._save_database()
+    
     def generate_pattern_id(self, error_type: str, error_message: str) -> str:
         """Generate a unique pattern ID."""
         # Create hash from error type and key parts of message
@@ -293,9 +299,21 @@ class FailurePatternDB:
             pattern.add_solution(new_solution)
             self.session_solutions[session_id].append(pattern_id)
         
-        self._save_database()
+        self._autosave()
         return pattern_id
     
+    def record_occurrence(self, pattern_id: str) -> bool:
+        """Count another sighting of a known pattern without re-matching it."""
+        if pattern_id not in self.patterns:
+            return False
+        
+        pattern = self.patterns[pattern_id]
+        pattern.occurrences += 1
+        pattern.last_seen = datetime.now().isoformat()
+        
+        self._autosave()
+        return True
+    
     def record_solution_result(self, pattern_id: str, solution_index: int, 
                              success: bool, session_id: str):
         """Record whether a solution worked or not."""
@@ -318,7 +336,7 @@ class FailurePatternDB:
             # Re-sort solutions by success rate
             pattern.solutions.sort(key=lambda s: s.success_rate, reverse=True)
             
-            self._save_database()
+            self._autosave()
     
     def _extract_error_patterns(self, error_message: str) -> List[str]:
         """Extract regex patterns from error message."""
@@ -6,7 +6,7 @@ Provides common functionality for creating and cleaning up mock data.
 
 import os
 import uuid
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable
 from datetime import datetime
 from abc import ABC, abstractmethod
 from dotenv import load_dotenv
@@ -120,6 +120,10 @@ class BaseMockCreator(ABC):
             self.created_records[table] = []
         self.created_records[table].append(record_id)
     
+    def track_created_records(self, table: str, record_ids: Iterable[str]):
+        """Track a batch of created records for cleanup in one call."""
+        self.created_records.setdefault(table, []).extend(record_ids)
+    
     def create_all_mock_data(self, **kwargs) -> Dict[str, Any]:
         """
         Main method to create all required mock data.
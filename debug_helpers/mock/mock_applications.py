@@ -9,8 +9,9 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import random
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+# When run as a script, make the repo root importable; package imports need no path changes
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from debug_helpers.mock.base_mock import BaseMockCreator
 
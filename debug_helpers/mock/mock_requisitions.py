@@ -6,14 +6,30 @@ Mock requisitions creator following schema constraints.
 import os
 import sys
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator, Tuple
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+# When run as a script, make the repo root importable; package imports need no path changes
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from debug_helpers.mock.base_mock import BaseMockCreator
 
 
+# Fields that are identical for every mock requisition insert
+REQUISITION_DEFAULTS = {
+    'source': 1,  # MUST BE 1 for recruiters to insert (RLS policy)
+    'is_deleted': False,
+    'is_public': True,  # Make visible for testing
+    'is_published': True,  # Also make published
+    'employment_type': 1,  # Full-time
+    'work_arrangement_type': 3,  # Hybrid
+    'min_years_of_experience': 2,
+    'max_years_of_experience': 5,
+    'min_salary': 100000,
+    'max_salary': 150000
+}
+
+
 class MockRequisitionsCreator(BaseMockCreator):
     """Creates mock requisitions following schema constraints."""
     
@@ -140,23 +156,20 @@ class MockRequisitionsCreator(BaseMockCreator):
             company_id = self.get_or_create_company()
         
         created_ids = []
+        created_title_ids = []
+        
+        # Only company_id and posting_date vary from the shared defaults
+        base_data = {
+            **REQUISITION_DEFAULTS,
+            'company_id': company_id,
+            'posting_date': datetime.now().isoformat()
+        }
+        english_prefix = f"{self.mock_prefix}Developer Position "
+        hebrew_prefix = f"{self.mock_prefix}משרת מפתח "
         
         for i in range(count):
             # Create requisition with required fields
-            requisition_data = {
-                'company_id': company_id,
-                'source': 1,  # MUST BE 1 for recruiters to insert (RLS policy)
-                'is_deleted': False,
-                'is_public': True,  # Make visible for testing
-                'is_published': True,  # Also make published
-                'employment_type': 1,  # Full-time
-                'work_arrangement_type': 3,  # Hybrid
-                'min_years_of_experience': 2,
-                'max_years_of_experience': 5,
-                'posting_date': datetime.now().isoformat(),
-                'min_salary': 100000,
-                'max_salary': 150000
-            }
+            requisition_data = base_data.copy()
             
             try:
                 result = self.supabase.table('requisitions').insert(requisition_data).execute()
@@ -165,8 +178,8 @@ class MockRequisitionsCreator(BaseMockCreator):
                     
                     # First create the title record
                     title_data = {
-                        'english': f"{self.mock_prefix}Developer Position {i+1}",
-                        'hebrew': f"{self.mock_prefix}משרת מפתח {i+1}"
+                        'english': f"{english_prefix}{i+1}",
+                        'hebrew': f"{hebrew_prefix}{i+1}"
                     }
                     
                     title_result = self.supabase.table('requisition_titles').insert(title_data).execute()
@@ -181,8 +194,7 @@ class MockRequisitionsCreator(BaseMockCreator):
                         
                         if update_result.data:
                             created_ids.append(req_id)
-                            self.track_created_record('requisitions', req_id)
-                            self.track_created_record('requisition_titles', title_id)
+                            created_title_ids.append(title_id)
                             print(f"[MOCK] Created requisition {i+1}: {req_id} with title: {title_id}")
                         else:
                             print(f"[MOCK] Failed to update requisition with title_id")
@@ -190,6 +202,9 @@ class MockRequisitionsCreator(BaseMockCreator):
             except Exception as e:
                 print(f"[MOCK] Error creating requisition {i+1}: {str(e)}")
         
+        self.track_created_records('requisitions', created_ids)
+        self.track_created_records('requisition_titles', created_title_ids)
+        
         return created_ids
     
     def get_cleanup_queries(self) -> List[str]:
@@ -211,46 +226,88 @@ class MockRequisitionsCreator(BaseMockCreator):
         
         return queries
     
-    def verify_created_records(self) -> Dict[str, Any]:
-        """Verify that all created records exist in the database."""
+    def verify_created_records(self, include_details: bool = False) -> Dict[str, Any]:
+        """
+        Verify that all created records exist in the database.
+        
+        Args:
+            include_details: Also collect per-requisition details (kept in memory until return)
+        """
+        if not include_details:
+            return self.verify_created_records_summary()
+        
         verification_results = {
             'verified_count': 0,
             'missing_records': [],
             'details': {}
         }
+        for req_id, details in self.iter_verified_records():
+            if details:
+                verification_results['verified_count'] += 1
+                verification_results['details'][req_id] = details
+            else:
+                verification_results['missing_records'].append(req_id)
         
-        # Verify requisitions
-        if 'requisitions' in self.created_records and self.created_records['requisitions']:
-            print(f"\n[VERIFY] Checking {len(self.created_records['requisitions'])} requisitions...")
-            
-            for req_id in self.created_records['requisitions']:
-                try:
-                    # Query requisition with joins to get complete data
-                    result = self.supabase.table('requisitions')\
-                        .select('*, requisition_titles!title_id(english, hebrew), companies!company_id(company_name)')\
-                        .eq('id', req_id)\
-                        .single()\
-                        .execute()
-                    
-                    if result.data:
-                        verification_results['verified_count'] += 1
-                        verification_results['details'][req_id] = {
-                            'exists': True,
-                            'title': result.data.get('requisition_titles', {}).get('english', 'N/A'),
-                            'company': result.data.get('companies', {}).get('company_name', 'N/A'),
-                            'is_public': result.data.get('is_public'),
-                            'is_deleted': result.data.get('is_deleted')
-                        }
-                        print(f"   Requisition {req_id[:8]}... verified")
-                        print(f"     Title: {result.data.get('requisition_titles', {}).get('english', 'N/A')}")
-                    else:
-                        verification_results['missing_records'].append(req_id)
-                        print(f"   Requisition {req_id[:8]}... NOT FOUND")
-                except Exception as e:
-                    print(f"    Error verifying {req_id[:8]}...: {str(e)}")
-                    verification_results['missing_records'].append(req_id)
+        self._verify_titles()
+        return verification_results
+    
+    def verify_created_records_summary(self) -> Dict[str, Any]:
+        """Verify created requisitions, keeping only counts and missing IDs."""
+        verification_results = {
+            'verified_count': 0,
+            'missing_records': []
+        }
+        for req_id, details in self.iter_verified_records():
+            if details:
+                verification_results['verified_count'] += 1
+            else:
+                verification_results['missing_records'].append(req_id)
+        
+        self._verify_titles()
+        return verification_results
+    
+    def iter_verified_records(self) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        Lazily verify created requisitions.
+        
+        Yields:
+            (req_id, details) pairs; details is None when the requisition is missing
+        """
+        if 'requisitions' not in self.created_records or not self.created_records['requisitions']:
+            return
+        
+        print(f"\n[VERIFY] Checking {len(self.created_records['requisitions'])} requisitions...")
         
-        # Verify requisition titles
+        for req_id in self.created_records['requisitions']:
+            try:
+                # Query requisition with joins to get complete data
+                result = self.supabase.table('requisitions')\
+                    .select('*, requisition_titles!title_id(english, hebrew), companies!company_id(company_name)')\
+                    .eq('id', req_id)\
+                    .single()\
+                    .execute()
+            except Exception as e:
+                print(f"    Error verifying {req_id[:8]}...: {str(e)}")
+                yield req_id, None
+                continue
+            
+            if result.data:
+                title = result.data.get('requisition_titles', {}).get('english', 'N/A')
+                print(f"   Requisition {req_id[:8]}... verified")
+                print(f"     Title: {title}")
+                yield req_id, {
+                    'exists': True,
+                    'title': title,
+                    'company': result.data.get('companies', {}).get('company_name', 'N/A'),
+                    'is_public': result.data.get('is_public'),
+                    'is_deleted': result.data.get('is_deleted')
+                }
+            else:
+                print(f"   Requisition {req_id[:8]}... NOT FOUND")
+                yield req_id, None
+    
+    def _verify_titles(self):
+        """Check that created requisition titles exist (informational only)."""
         if 'requisition_titles' in self.created_records and self.created_records['requisition_titles']:
             print(f"\n[VERIFY] Checking {len(self.created_records['requisition_titles'])} titles...")
             
@@ -266,8 +323,6 @@ class MockRequisitionsCreator(BaseMockCreator):
                         print(f"   Title {title_id[:8]}... verified: {result.data.get('english', 'N/A')}")
                 except Exception as e:
                     print(f"    Error verifying title {title_id[:8]}...: {str(e)}")
-        
-        return verification_results
     
 
 
@@ -5,12 +5,13 @@ Mock users creator following schema constraints.
 
 import os
 import sys
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator, Tuple
 from datetime import datetime
 import uuid
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+# When run as a script, make the repo root importable; package imports need no path changes
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from debug_helpers.mock.base_mock import BaseMockCreator
 
@@ -69,11 +70,15 @@ class MockUsersCreator(BaseMockCreator):
         
         created_ids = []
         
-        for i in range(count):
+        # Precompute per-row values so the loop body is only I/O and dict assembly
+        password = f"Test@{self.test_id}123!"  # Strong password for testing
+        emails = [self.generate_mock_email(f"{role}{i+1}") for i in range(count)]
+        phones = [self.generate_mock_phone() for _ in range(count)]
+        name_prefix = f"{self.mock_prefix}User "
+        linkedin_prefix = f"https://linkedin.com/in/{self.mock_prefix.lower()}user"
+        
+        for i, (email, phone) in enumerate(zip(emails, phones)):
             # Step 1: Create auth user via Supabase Auth
-            email = self.generate_mock_email(f"{role}{i+1}")
-            password = f"Test@{self.test_id}123!"  # Strong password for testing
-            
             try:
                 # Create auth user
                 print(f"[MOCK] Creating auth user: {email}")
@@ -88,11 +93,11 @@ class MockUsersCreator(BaseMockCreator):
                     # Step 2: Create user_details entry
                     user_details_data = {
                         'user_id': user_id,
-                        'name': f"{self.mock_prefix}User {i+1}",
+                        'name': f"{name_prefix}{i+1}",
                         'email': email,
-                        'phone_number': self.generate_mock_phone(),
+                        'phone_number': phone,
                         'role': role,
-                        'linkedin': f"https://linkedin.com/in/{self.mock_prefix.lower()}user{i+1}",
+                        'linkedin': f"{linkedin_prefix}{i+1}",
                         'location': 'Tel Aviv, Israel'
                     }
                     
@@ -111,8 +116,6 @@ class MockUsersCreator(BaseMockCreator):
                     
                     if details_result.data:
                         created_ids.append(user_id)
-                        self.track_created_record('user_details', user_id)
-                        self.track_created_record('auth_users', user_id)  # Track for cleanup
                         print(f"[MOCK] Created {role} user {i+1}: {user_id}")
                         print(f"[MOCK]   Email: {email}")
                         print(f"[MOCK]   Password: {password}")
@@ -127,6 +130,9 @@ class MockUsersCreator(BaseMockCreator):
                 if "already been registered" in str(e):
                     print(f"[MOCK] Email {email} already exists - skipping")
         
+        self.track_created_records('user_details', created_ids)
+        self.track_created_records('auth_users', created_ids)  # Track for cleanup
+        
         return created_ids
     
     def get_cleanup_queries(self) -> List[str]:
@@ -149,54 +155,93 @@ class MockUsersCreator(BaseMockCreator):
         
         return queries
     
-    def verify_created_records(self) -> Dict[str, Any]:
-        """Verify that all created records exist in the database."""
+    def verify_created_records(self, include_details: bool = False) -> Dict[str, Any]:
+        """
+        Verify that all created records exist in the database.
+        
+        Args:
+            include_details: Also collect per-user details (kept in memory until return)
+        """
+        if not include_details:
+            return self.verify_created_records_summary()
+        
         verification_results = {
             'verified_count': 0,
             'missing_records': [],
             'details': {}
         }
+        for user_id, details in self.iter_verified_records():
+            if details:
+                verification_results['verified_count'] += 1
+                verification_results['details'][user_id] = details
+            else:
+                verification_results['missing_records'].append(user_id)
         
-        if 'user_details' in self.created_records and self.created_records['user_details']:
-            print(f"\n[VERIFY] Checking {len(self.created_records['user_details'])} users...")
-            
-            for user_id in self.created_records['user_details']:
-                try:
-                    # Verify user_details entry
-                    result = self.supabase.table('user_details')\
-                        .select('*, companies!company_id(company_name)')\
-                        .eq('user_id', user_id)\
-                        .single()\
-                        .execute()
-                    
-                    if result.data:
-                        verification_results['verified_count'] += 1
-                        verification_results['details'][user_id] = {
-                            'exists': True,
-                            'name': result.data.get('name'),
-                            'email': result.data.get('email'),
-                            'role': result.data.get('role'),
-                            'company': result.data.get('companies', {}).get('company_name', 'N/A')
-                        }
-                        print(f"   User {user_id[:8]}... verified")
-                        print(f"     Name: {result.data.get('name')}")
-                        print(f"     Role: {result.data.get('role')}")
-                        if result.data.get('company_id'):
-                            print(f"     Company: {result.data.get('companies', {}).get('company_name', 'N/A')}")
-                    else:
-                        verification_results['missing_records'].append(user_id)
-                        print(f"   User {user_id[:8]}... NOT FOUND in user_details")
-                    
-                    # Also check auth.users (requires admin access, so we'll check if we can authenticate)
-                    if 'auth_users' in self.created_records and user_id in self.created_records['auth_users']:
-                        print(f"     Auth user created but verification requires admin access")
-                        
-                except Exception as e:
-                    print(f"    Error verifying {user_id[:8]}...: {str(e)}")
-                    verification_results['missing_records'].append(user_id)
+        return verification_results
+    
+    def verify_created_records_summary(self) -> Dict[str, Any]:
+        """Verify created users, keeping only counts and missing IDs."""
+        verification_results = {
+            'verified_count': 0,
+            'missing_records': []
+        }
+        for user_id, details in self.iter_verified_records():
+            if details:
+                verification_results['verified_count'] += 1
+            else:
+                verification_results['missing_records'].append(user_id)
         
         return verification_results
     
+    def iter_verified_records(self) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        Lazily verify created users.
+        
+        Yields:
+            (user_id, details) pairs; details is None when the user is missing
+        """
+        if 'user_details' not in self.created_records or not self.created_records['user_details']:
+            return
+        
+        print(f"\n[VERIFY] Checking {len(self.created_records['user_details'])} users...")
+        
+        for user_id in self.created_records['user_details']:
+            try:
+                # Verify user_details entry
+                result = self.supabase.table('user_details')\
+                    .select('*, companies!company_id(company_name)')\
+                    .eq('user_id', user_id)\
+                    .single()\
+                    .execute()
+            except Exception as e:
+                print(f"    Error verifying {user_id[:8]}...: {str(e)}")
+                yield user_id, None
+                continue
+            
+            if result.data:
+                print(f"   User {user_id[:8]}... verified")
+                print(f"     Name: {result.data.get('name')}")
+                print(f"     Role: {result.data.get('role')}")
+                if result.data.get('company_id'):
+                    print(f"     Company: {result.data.get('companies', {}).get('company_name', 'N/A')}")
+            else:
+                print(f"   User {user_id[:8]}... NOT FOUND in user_details")
+            
+            # Also check auth.users (requires admin access, so we'll check if we can authenticate)
+            if 'auth_users' in self.created_records and user_id in self.created_records['auth_users']:
+                print(f"     Auth user created but verification requires admin access")
+            
+            if result.data:
+                yield user_id, {
+                    'exists': True,
+                    'name': result.data.get('name'),
+                    'email': result.data.get('email'),
+                    'role': result.data.get('role'),
+                    'company': result.data.get('companies', {}).get('company_name', 'N/A')
+                }
+            else:
+                yield user_id, None
+    
     def create_seeker_with_resume(self, **kwargs) -> Optional[str]:
         """
         Create a seeker (job candidate) user with a complete resume.
@@ -5,11 +5,40 @@ Defines test scenarios, resource allocation, and parallelism settings.
 """
 
 import os
+import threading
 import multiprocessing
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Iterable, Tuple, Set
+from dataclasses import dataclass, field
 from enum import Enum
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+def _detect_available_cpus() -> int:
+    """Count CPUs this process may actually use (affinity mask and cgroup v2 quota)."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = multiprocessing.cpu_count()
+    
+    # cgroup v2 quota, e.g. "200000 100000" means 2 CPUs; "max" means unlimited
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()[:2]
+        if quota != 'max':
+            cpus = min(cpus, max(1, int(quota) // int(period)))
+    except (OSError, ValueError):
+        pass
+    
+    return cpus
+
+# Available CPUs do not change during a run; query them once
+CPU_COUNT = _detect_available_cpus()
+
 class TestType(Enum):
     """Types of tests that can be run in parallel."""
     UI_FLOW = "ui_flow"
@@ -19,7 +48,7 @@ class TestType(Enum):
     PERFORMANCE = "performance"
     SECURITY = "security"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TestScenario:
     """Defines a single test scenario for parallel execution."""
     name: str
@@ -31,19 +60,15 @@ class TestScenario:
     timeout: int = 120  # seconds
     retry_on_failure: bool = True
     max_retries: int = 2
-    required_resources: Dict[str, Any] = None
-    environment_vars: Dict[str, str] = None
-    
-    def __post_init__(self):
-        if self.required_resources is None:
-            self.required_resources = {}
-        if self.environment_vars is None:
-            self.environment_vars = {}
+    # Dicts aren't hashable; leave them out of the hash so scenarios stay hashable
+    required_resources: Dict[str, Any] = field(default_factory=dict, hash=False)
+    environment_vars: Dict[str, str] = field(default_factory=dict, hash=False)
 
 @dataclass
 class ResourceConfig:
     """Configuration for system resources during parallel execution."""
     max_workers: int = None  # Auto-detect if None
+    hard_worker_cap: int = 16  # Upper bound for auto-detected max_workers
     max_browsers_per_worker: int = 1
     base_port: int = 3100  # Start allocating ports from here
     port_range: int = 100  # Allocate ports in range [base_port, base_port + port_range]
@@ -53,8 +78,8 @@ class ResourceConfig:
     
     def __post_init__(self):
         if self.max_workers is None:
-            # Use 75% of available CPU cores by default
-            self.max_workers = max(1, int(multiprocessing.cpu_count() * 0.75))
+            # Use 75% of available CPU cores by default, capped to avoid oversubscription
+            self.max_workers = max(1, min(self.hard_worker_cap, int(CPU_COUNT * 0.75)))
 
 class ParallelDebugConfig:
     """Main configuration class for parallel debugging."""
@@ -62,57 +87,96 @@ class ParallelDebugConfig:
     def __init__(self):
         self.resource_config = ResourceConfig()
         self.scenarios: List[TestScenario] = []
-        self.allocated_ports: Dict[str, int] = {}
-        self.next_port = self.resource_config.base_port
+        self.allocated_ports: Dict[str, List[int]] = {}
+        
+        # Free-list of ports; released ports go back on it for reuse
+        self._port_lock = threading.Lock()
+        self._free_ports: deque = deque()
+        self._port_bounds = None
+        self._sync_port_pool()
+        
+        # Scenario names seen so far and the ones seen more than once, kept up
+        # to date by add_scenario(s); _indexed_scenarios is what they describe
+        self._scenario_names: Set[str] = set()
+        self._duplicate_names: Set[str] = set()
+        self._indexed_scenarios: List[TestScenario] = []
         
     def add_scenario(self, scenario: TestScenario) -> None:
         """Add a test scenario to the configuration."""
         self.scenarios.append(scenario)
+        self._index_scenario(scenario)
         
-    def add_scenarios(self, scenarios: List[TestScenario]) -> None:
+    def add_scenarios(self, scenarios: Iterable[TestScenario]) -> None:
         """Add multiple test scenarios."""
-        self.scenarios.extend(scenarios)
+        for scenario in scenarios:
+            self.add_scenario(scenario)
+    
+    def _index_scenario(self, scenario: TestScenario) -> None:
+        """Record a scenario's name, noting it if it is a duplicate."""
+        if scenario.name in self._scenario_names:
+            self._duplicate_names.add(scenario.name)
+        else:
+            self._scenario_names.add(scenario.name)
+        self._indexed_scenarios.append(scenario)
         
+    def _sync_port_pool(self) -> None:
+        """(Re)seed the free-list if the configured port range has changed."""
+        bounds = (self.resource_config.base_port, self.resource_config.port_range)
+        if bounds == self._port_bounds:
+            return
+        
+        base_port, port_range = bounds
+        in_use = {port for ports in self.allocated_ports.values() for port in ports}
+        self._free_ports = deque(
+            port for port in range(base_port, base_port + port_range) if port not in in_use
+        )
+        self._port_bounds = bounds
+    
     def allocate_ports(self, worker_id: str, count: int = 2) -> List[int]:
         """Allocate unique ports for a worker (UI and API)."""
-        if worker_id in self.allocated_ports:
-            raise ValueError(f"Ports already allocated for worker {worker_id}")
-        
-        ports = []
-        for _ in range(count):
-            if self.next_port >= self.resource_config.base_port + self.resource_config.port_range:
+        with self._port_lock:
+            if worker_id in self.allocated_ports:
+                raise ValueError(f"Ports already allocated for worker {worker_id}")
+            
+            self._sync_port_pool()
+            if len(self._free_ports) < count:
                 raise RuntimeError("Port range exhausted")
             
-            ports.append(self.next_port)
-            self.next_port += 1
-        
-        self.allocated_ports[worker_id] = ports
-        return ports
+            ports = [self._free_ports.popleft() for _ in range(count)]
+            self.allocated_ports[worker_id] = ports
+            return ports
     
     def release_ports(self, worker_id: str) -> None:
-        """Release ports allocated to a worker."""
-        if worker_id in self.allocated_ports:
-            del self.allocated_ports[worker_id]
+        """Release ports allocated to a worker so they can be reused."""
+        with self._port_lock:
+            ports = self.allocated_ports.pop(worker_id, None)
+            if ports:
+                self._free_ports.extend(ports)
     
-    def get_worker_env(self, worker_id: str, scenario: TestScenario) -> Dict[str, str]:
-        """Get environment variables for a worker."""
-        env = os.environ.copy()
+    def get_worker_env(self, worker_id: str, scenario: TestScenario,
+                       base_env: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Get environment variables for a worker.
         
+        Args:
+            base_env: Snapshot of the parent environment to build on (defaults to os.environ)
+        """
         # Add worker-specific ports
+        port_env = {}
         if worker_id in self.allocated_ports:
             ports = self.allocated_ports[worker_id]
-            env['APP_PORT'] = str(ports[0])
-            env['API_PORT'] = str(ports[1]) if len(ports) > 1 else str(ports[0] + 1)
-        
-        # Add scenario-specific environment variables
-        env.update(scenario.environment_vars)
-        
-        # Add debugging-specific variables
-        env['PARALLEL_WORKER_ID'] = worker_id
-        env['PARALLEL_SCENARIO'] = scenario.name
-        env['DEBUG_MODE'] = 'parallel'
+            port_env['APP_PORT'] = str(ports[0])
+            port_env['API_PORT'] = str(ports[1]) if len(ports) > 1 else str(ports[0] + 1)
         
-        return env
+        # Single merge: base, ports, scenario-specific, then debugging-specific variables
+        return {
+            **(os.environ if base_env is None else base_env),
+            **port_env,
+            **scenario.environment_vars,
+            'PARALLEL_WORKER_ID': worker_id,
+            'PARALLEL_SCENARIO': scenario.name,
+            'DEBUG_MODE': 'parallel'
+        }
     
     def validate_configuration(self) -> List[str]:
         """Validate the configuration and return any warnings."""
@@ -138,26 +202,31 @@ class ParallelDebugConfig:
                 f"available memory ({available_memory}MB)"
             )
         
-        # Check for duplicate scenario names
-        names = [s.name for s in self.scenarios]
-        duplicates = [name for name in names if names.count(name) > 1]
-        if duplicates:
-            warnings.append(f"Duplicate scenario names found: {set(duplicates)}")
+        # Duplicate names are tracked as scenarios are added. If the list was
+        # assigned or edited directly since, index it again; comparing the two
+        # lists is a pass of identity checks for unchanged entries
+        if self._indexed_scenarios != self.scenarios:
+            self._scenario_names.clear()
+            self._duplicate_names.clear()
+            self._indexed_scenarios = []
+            for scenario in self.scenarios:
+                self._index_scenario(scenario)
+        if self._duplicate_names:
+            warnings.append(f"Duplicate scenario names found: {set(self._duplicate_names)}")
         
         return warnings
     
     def _get_available_memory_mb(self) -> Optional[int]:
         """Get available system memory in MB."""
-        try:
-            import psutil
-            return psutil.virtual_memory().available // (1024 * 1024)
-        except ImportError:
+        if psutil is None:
             return None
+        return psutil.virtual_memory().available // (1024 * 1024)
 
 # Predefined scenario templates
-def get_standard_scenarios() -> List[TestScenario]:
+@lru_cache(maxsize=1)
+def get_standard_scenarios() -> Tuple[TestScenario, ...]:
     """Get a standard set of test scenarios for debugging."""
-    return [
+    return (
         TestScenario(
             name="recruiter_job_creation",
             test_type=TestType.UI_FLOW,
@@ -188,11 +257,12 @@ def get_standard_scenarios() -> List[TestScenario]:
             data_set="large",
             required_resources={"database_connections": 5}
         )
-    ]
+    )
 
-def get_auth_scenarios() -> List[TestScenario]:
+@lru_cache(maxsize=1)
+def get_auth_scenarios() -> Tuple[TestScenario, ...]:
     """Get authentication-specific test scenarios."""
-    return [
+    return (
         TestScenario(
             name="auth_login_recruiter",
             test_type=TestType.UI_FLOW,
@@ -220,11 +290,12 @@ def get_auth_scenarios() -> List[TestScenario]:
             timeout=180,
             environment_vars={"SESSION_TIMEOUT": "60"}
         )
-    ]
+    )
 
-def get_performance_scenarios() -> List[TestScenario]:
+@lru_cache(maxsize=1)
+def get_performance_scenarios() -> Tuple[TestScenario, ...]:
     """Get performance testing scenarios."""
-    return [
+    return (
         TestScenario(
             name="perf_job_list_loading",
             test_type=TestType.PERFORMANCE,
@@ -247,7 +318,7 @@ def get_performance_scenarios() -> List[TestScenario]:
             timeout=300,
             required_resources={"requests_per_second": 100}
         )
-    ]
+    )
 
 # Example usage
 if __name__ == "__main__":
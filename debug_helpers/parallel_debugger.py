@@ -8,23 +8,28 @@ import os
 import sys
 import time
 import signal
+import queue
 import asyncio
+import multiprocessing
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 from datetime import datetime
 from multiprocessing import Process, Queue, Event, Manager
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.connection import wait
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import threading
+from collections import deque
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from debug_session import DebugSession
 from debug_session_state import DebugSessionState
 from parallel_config import ParallelDebugConfig, TestScenario, ResourceConfig
 from debug_worker import run_worker
-from result_aggregator import ResultAggregator, AggregatedResults
-from parallel_monitor import ParallelMonitor
+
+if TYPE_CHECKING:
+    # Heavier modules are imported on first use to keep module import cheap
+    from result_aggregator import AggregatedResults
 
 
 class ParallelDebugger:
@@ -35,19 +40,44 @@ class ParallelDebugger:
         self.issue_type = issue_type
         self.config = config or ParallelDebugConfig()
         
+        from debug_session import DebugSession
+        from result_aggregator import ResultAggregator
+        
         # Create master debug session
         self.master_session = DebugSession(f"parallel-{issue_type}")
         self.master_state = DebugSessionState(self.master_session.session_id)
         
+        # Start workers from a fork server with debug_worker preloaded, so each
+        # worker skips re-importing it and is not forked from this (threaded) process
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            self.mp_context = multiprocessing.get_context('forkserver')
+            self.mp_context.set_forkserver_preload(['debug_worker'])
+        else:
+            self.mp_context = multiprocessing.get_context()
+        
         # Multiprocessing components
-        self.manager = Manager()
-        self.result_queue = self.manager.Queue()
+        self.manager = self.mp_context.Manager()
+        # Results go through plain queues (no Manager round-trip), sharded by worker
+        self.result_queues = [
+            self.mp_context.Queue()
+            for _ in range(max(1, min(self.config.resource_config.max_workers, 8)))
+        ]
         self.status_queue = self.manager.Queue()
-        self.shutdown_event = self.manager.Event()
+        # Completion messages go over a one-way pipe the synchronous path can
+        # wait on; they are far below PIPE_BUF, so workers' writes don't interleave
+        self.done_reader, self.done_writer = self.mp_context.Pipe(duplex=False)
+        # Shared-semaphore event: workers check it without a Manager round-trip
+        self.shutdown_event = self.mp_context.Event()
+        
+        # The parent environment doesn't change during a run; snapshot it once
+        self._env_snapshot = dict(os.environ)
         
         # Worker tracking
         self.workers: Dict[str, Process] = {}
         self.worker_scenarios: Dict[str, TestScenario] = {}
+        # Workers are started from a thread pool; guards the tracking dicts
+        self._workers_lock = threading.Lock()
+        self._next_worker_index = 0
         
         # Results and monitoring
         self.aggregator = ResultAggregator(self.master_session.session_id)
@@ -75,8 +105,43 @@ class ParallelDebugger:
     
     async def run_parallel(self, scenarios: Optional[List[TestScenario]] = None,
                           max_workers: Optional[int] = None,
-                          with_monitor: bool = True) -> AggregatedResults:
+                          with_monitor: bool = True) -> "AggregatedResults":
         """Run scenarios in parallel and return aggregated results."""
+        scenarios = self._prepare_run(scenarios, max_workers, with_monitor)
+        
+        try:
+            # Execute scenarios
+            await self._execute_scenarios(scenarios)
+            return self._finish_run()
+            
+        except Exception as e:
+            self._record_run_failure(e, scenarios)
+            raise
+        
+        finally:
+            self.shutdown()
+    
+    def run_parallel_sync(self, scenarios: Optional[List[TestScenario]] = None,
+                          max_workers: Optional[int] = None,
+                          with_monitor: bool = True) -> "AggregatedResults":
+        """Run scenarios in parallel without an event loop, blocking until done."""
+        scenarios = self._prepare_run(scenarios, max_workers, with_monitor)
+        
+        try:
+            # Execute scenarios
+            self._execute_scenarios_sync(scenarios)
+            return self._finish_run()
+            
+        except Exception as e:
+            self._record_run_failure(e, scenarios)
+            raise
+        
+        finally:
+            self.shutdown()
+    
+    def _prepare_run(self, scenarios: Optional[List[TestScenario]],
+                     max_workers: Optional[int], with_monitor: bool) -> List[TestScenario]:
+        """Validate configuration, record initial state and start monitoring."""
         # Use provided scenarios or config scenarios
         scenarios = scenarios or self.config.scenarios
         if not scenarios:
@@ -107,93 +172,189 @@ class ParallelDebugger:
         print(f" Executing {len(scenarios)} scenarios with up to {self.config.resource_config.max_workers} workers")
         print()
         
-        try:
-            # Execute scenarios
-            await self._execute_scenarios(scenarios)
-            
-            # Wait for all results
-            results = self._collect_results()
-            
-            # Aggregate results
-            self.master_state.set_current_step("aggregation", "Aggregating results from all workers")
-            aggregated = self.aggregator.aggregate()
-            
-            # Save final state
-            self.master_state.create_checkpoint(
-                "parallel_execution_complete",
-                f"Completed {aggregated.total_scenarios} scenarios"
-            )
-            
-            # Generate and display report
-            print("\n" + "="*80)
-            print(self.aggregator.generate_report())
-            
-            return aggregated
-            
-        except Exception as e:
-            print(f" Parallel execution failed: {str(e)}")
-            self.master_state.record_failed_attempt(
-                "Parallel execution",
-                str(e),
-                {"scenarios": len(scenarios)},
-                "Master orchestrator failure"
-            )
-            raise
+        return scenarios
+    
+    def _finish_run(self) -> "AggregatedResults":
+        """Collect results, aggregate them and print the report."""
+        # Wait for all results (streamed into the aggregator)
+        self._collect_results()
         
-        finally:
-            self.shutdown()
+        # Aggregate results
+        self.master_state.set_current_step("aggregation", "Aggregating results from all workers")
+        aggregated = self.aggregator.aggregate()
+        
+        # Save final state
+        self.master_state.create_checkpoint(
+            "parallel_execution_complete",
+            f"Completed {aggregated.total_scenarios} scenarios"
+        )
+        
+        # Generate and display report
+        print("\n" + "="*80)
+        print(self.aggregator.generate_report())
+        
+        return aggregated
+    
+    def _record_run_failure(self, error: Exception, scenarios: List[TestScenario]):
+        """Record an orchestrator-level failure in the master state."""
+        print(f" Parallel execution failed: {str(error)}")
+        self.master_state.record_failed_attempt(
+            "Parallel execution",
+            str(error),
+            {"scenarios": len(scenarios)},
+            "Master orchestrator failure"
+        )
     
     async def _execute_scenarios(self, scenarios: List[TestScenario]):
         """Execute scenarios in parallel batches."""
         self.master_state.set_current_step("execution", "Running scenarios in parallel")
         
+        # Workers report completion on the done pipe; forward those into the event loop
+        loop = asyncio.get_running_loop()
+        finished: asyncio.Queue = asyncio.Queue()
+        listener = threading.Thread(
+            target=self._listen_for_completions,
+            args=(loop, finished),
+            daemon=True
+        )
+        listener.start()
+        
         # Process scenarios in batches based on max workers
-        scenario_queue = list(scenarios)
+        scenario_queue = deque(scenarios)
         active_workers = {}
+        # Live map of process sentinel -> worker_id for the active workers only
+        sentinels = {}
+        completed = 0
+        
+        try:
+            while scenario_queue or active_workers:
+                # Start new workers up to the limit
+                self._launch_workers(scenario_queue, active_workers, sentinels)
+                
+                if not active_workers:
+                    continue
+                
+                # Block until a worker reports completion
+                try:
+                    completed_workers = [await asyncio.wait_for(finished.get(), timeout=1.0)]
+                    while not finished.empty():
+                        completed_workers.append(finished.get_nowait())
+                except asyncio.TimeoutError:
+                    # Fallback for workers that died without reporting: one
+                    # non-blocking wait over the active sentinels
+                    completed_workers = [sentinels[s] for s in wait(list(sentinels), timeout=0)]
+                
+                # Clean up completed workers
+                completed = self._finish_workers(
+                    completed_workers, active_workers, sentinels, completed, len(scenarios)
+                )
+        finally:
+            # Stop the listener thread
+            self.done_writer.send(None)
+            listener.join(timeout=1)
+    
+    def _execute_scenarios_sync(self, scenarios: List[TestScenario]):
+        """Execute scenarios in parallel batches, blocking in the OS until a worker finishes."""
+        self.master_state.set_current_step("execution", "Running scenarios in parallel")
+        
+        scenario_queue = deque(scenarios)
+        active_workers = {}
+        sentinels = {}
         completed = 0
         
         while scenario_queue or active_workers:
             # Start new workers up to the limit
-            while scenario_queue and len(active_workers) < self.config.resource_config.max_workers:
-                scenario = scenario_queue.pop(0)
-                worker_id = self._start_worker(scenario)
-                if worker_id:
-                    active_workers[worker_id] = scenario
+            self._launch_workers(scenario_queue, active_workers, sentinels)
+            
+            if not active_workers:
+                continue
             
-            # Check for completed workers
-            completed_workers = []
-            for worker_id, process in self.workers.items():
-                if worker_id in active_workers and not process.is_alive():
-                    completed_workers.append(worker_id)
+            # Wake on a completion message or on any active worker exiting
+            ready = wait([self.done_reader, *sentinels], timeout=1.0)
+            completed_workers = [sentinels[r] for r in ready if r in sentinels]
+            if self.done_reader in ready:
+                completed_workers.extend(self._drain_done_messages())
             
             # Clean up completed workers
-            for worker_id in completed_workers:
-                scenario = active_workers.pop(worker_id)
-                del self.workers[worker_id]
-                self.config.release_ports(worker_id)
-                completed += 1
-                
-                print(f" Completed {scenario.name} ({completed}/{len(scenarios)})")
+            completed = self._finish_workers(
+                completed_workers, active_workers, sentinels, completed, len(scenarios)
+            )
+    
+    def _launch_workers(self, scenario_queue: deque, active_workers: Dict[str, TestScenario],
+                        sentinels: Dict[Any, str]):
+        """Start workers for queued scenarios up to the max_workers limit."""
+        free_slots = self.config.resource_config.max_workers - len(active_workers)
+        batch = [scenario_queue.popleft() for _ in range(min(free_slots, len(scenario_queue)))]
+        if not batch:
+            return
+        
+        # Process.start() blocks while the child is forked/spawned, so start
+        # the whole batch concurrently instead of one after another
+        if len(batch) == 1:
+            worker_ids = [self._start_worker(batch[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=len(batch)) as pool:
+                worker_ids = list(pool.map(self._start_worker, batch))
+        
+        for scenario, worker_id in zip(batch, worker_ids):
+            if worker_id:
+                active_workers[worker_id] = scenario
+                sentinels[self.workers[worker_id].sentinel] = worker_id
+    
+    def _finish_workers(self, worker_ids: List[str], active_workers: Dict[str, TestScenario],
+                        sentinels: Dict[Any, str], completed: int, total: int) -> int:
+        """Release resources of finished workers and return the updated completed count."""
+        for worker_id in worker_ids:
+            # A worker can be reported both by its message and by its exit
+            if worker_id not in active_workers:
+                continue
+            scenario = active_workers.pop(worker_id)
+            del sentinels[self.workers[worker_id].sentinel]
+            self.config.release_ports(worker_id)
+            completed += 1
             
-            # Brief sleep to prevent busy waiting
-            await asyncio.sleep(0.1)
+            print(f" Completed {scenario.name} ({completed}/{total})")
+        
+        return completed
+    
+    def _drain_done_messages(self) -> List[str]:
+        """Read all pending completion messages without blocking."""
+        worker_ids = []
+        while self.done_reader.poll():
+            message = self.done_reader.recv()
+            if message is not None:
+                worker_ids.append(message[1])
+        return worker_ids
+    
+    def _listen_for_completions(self, loop: asyncio.AbstractEventLoop, finished: asyncio.Queue):
+        """Forward worker completion messages from the done pipe into the event loop."""
+        while True:
+            message = self.done_reader.recv()
+            if message is None:
+                break
+            _, worker_id = message
+            loop.call_soon_threadsafe(finished.put_nowait, worker_id)
     
     def _start_worker(self, scenario: TestScenario) -> Optional[str]:
         """Start a worker process for a scenario."""
-        worker_id = f"worker_{len(self.workers)}"
+        # IDs are never reused within a run, even for workers that failed to start
+        with self._workers_lock:
+            worker_id = f"worker_{self._next_worker_index}"
+            self._next_worker_index += 1
         
         try:
             # Allocate ports
             ports = self.config.allocate_ports(worker_id)
             
             # Get worker environment
-            env = self.config.get_worker_env(worker_id, scenario)
+            env = self.config.get_worker_env(worker_id, scenario, self._env_snapshot)
             
             # Create worker process
-            process = Process(
+            process = self.mp_context.Process(
                 target=run_worker,
-                args=(worker_id, scenario, self.result_queue, 
-                      self.status_queue, self.shutdown_event, env),
+                args=(worker_id, scenario, self._result_queue_for(worker_id), 
+                      self.status_queue, self.shutdown_event, env,
+                      self.done_writer),
                 name=f"DebugWorker-{worker_id}"
             )
             
@@ -201,8 +362,9 @@ class ParallelDebugger:
             process.start()
             
             # Track worker
-            self.workers[worker_id] = process
-            self.worker_scenarios[worker_id] = scenario
+            with self._workers_lock:
+                self.workers[worker_id] = process
+                self.worker_scenarios[worker_id] = scenario
             
             print(f" Started {worker_id} for scenario '{scenario.name}' (ports: {ports})")
             
@@ -213,35 +375,65 @@ class ParallelDebugger:
             self.config.release_ports(worker_id)
             return None
     
-    def _collect_results(self) -> List[Dict]:
-        """Collect all results from the result queue."""
+    def _result_queue_for(self, worker_id: str) -> Queue:
+        """Pick the result queue shard for a worker."""
+        return self.result_queues[hash(worker_id) % len(self.result_queues)]
+    
+    def _collect_results(self) -> None:
+        """Feed all results from the result queues into the aggregator."""
         print("\n Collecting results from workers...")
         
-        results = []
-        timeout_count = 0
-        max_timeouts = 10
+        reported = set()
+        # Back off from 0.1s to 2s while idle; give up after 50s without a result
+        timeout = 0.1
+        idle_time = 0.0
+        max_idle_time = 50.0
         
-        while len(results) < len(self.worker_scenarios):
-            try:
-                # Get result with timeout
-                result = self.result_queue.get(timeout=5)
-                results.append(result)
-                self.aggregator.add_result(result)
-                
-                # Reset timeout count on successful get
-                timeout_count = 0
+        while len(reported) < len(self.worker_scenarios):
+            if not self._receive_results(reported, timeout):
+                # A worker that exited has already flushed its result into its shard,
+                # so once no unreported worker is alive and the shards are empty, stop
+                pending_alive = any(
+                    process.is_alive() for worker_id, process in self.workers.items()
+                    if worker_id not in reported
+                )
+                if not pending_alive and not self._receive_results(reported, 0):
+                    print(f"  Workers exited without reporting. Got {len(reported)}/{len(self.worker_scenarios)}")
+                    break
                 
-            except:
-                timeout_count += 1
-                if timeout_count >= max_timeouts:
-                    print(f"  Timeout waiting for results. Got {len(results)}/{len(self.worker_scenarios)}")
+                idle_time += timeout
+                if idle_time >= max_idle_time:
+                    print(f"  Timeout waiting for results. Got {len(reported)}/{len(self.worker_scenarios)}")
                     break
-        
-        return results
+                timeout = min(timeout * 2, 2.0)
+                continue
+            
+            # Reset backoff on successful get
+            timeout = 0.1
+            idle_time = 0.0
+    
+    def _receive_results(self, reported: set, timeout: float) -> bool:
+        """Visit the result shards in turn, feeding what each holds into the aggregator."""
+        received = False
+        # Each shard waits for a slice of the timeout, so an idle shard
+        # doesn't hold up results arriving on the others
+        shard_timeout = timeout / len(self.result_queues)
+        for result_queue in self.result_queues:
+            try:
+                result = result_queue.get(timeout=shard_timeout)
+                while True:
+                    reported.add(result.get('worker_id'))
+                    self.aggregator.add_result(result)
+                    received = True
+                    result = result_queue.get_nowait()
+            except queue.Empty:
+                pass
+        return received
     
     def _start_monitoring(self):
         """Start the monitoring dashboard in a separate thread."""
         try:
+            from parallel_monitor import ParallelMonitor
             self.monitor = ParallelMonitor(self.status_queue, self.worker_scenarios)
             self.monitor_thread = threading.Thread(
                 target=self.monitor.run,
@@ -258,21 +450,35 @@ class ParallelDebugger:
         # Signal all workers to shutdown
         self.shutdown_event.set()
         
-        # Wait for workers to finish (with timeout)
-        for worker_id, process in self.workers.items():
-            process.join(timeout=5)
-            if process.is_alive():
-                print(f"  Force terminating {worker_id}")
-                process.terminate()
-                process.join(timeout=2)
+        # Wait for all workers together (5s total, not 5s each)
+        alive = {
+            process.sentinel: (worker_id, process)
+            for worker_id, process in self.workers.items() if process.is_alive()
+        }
+        deadline = time.monotonic() + 5
+        while alive:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for sentinel in wait(list(alive), timeout=remaining):
+                del alive[sentinel]
+        
+        # Force terminate stragglers in one pass, then wait for them together
+        for worker_id, process in alive.values():
+            print(f"  Force terminating {worker_id}")
+            process.terminate()
+        if alive:
+            wait(list(alive), timeout=2)
         
         # Stop monitoring
         if self.monitor:
             self.monitor.stop()
         
-        # Clean up resources
-        for worker_id in list(self.workers.keys()):
+        # Reap workers; release_ports is a no-op for workers that already completed
+        for worker_id, process in self.workers.items():
+            process.join(timeout=0)
             self.config.release_ports(worker_id)
+        self.workers.clear()
         
         # Save final state
         self.master_state.complete_current_step("Parallel execution shutdown")
@@ -281,7 +487,7 @@ class ParallelDebugger:
     
     def run_scenario_batch(self, scenario_names: List[str],
                           test_type: str = "ui_flow",
-                          user_type: Optional[str] = None) -> AggregatedResults:
+                          user_type: Optional[str] = None) -> "AggregatedResults":
         """Convenience method to run a batch of similar scenarios."""
         scenarios = []
         
@@ -295,50 +501,35 @@ class ParallelDebugger:
             scenarios.append(scenario)
         
         # Run synchronously for convenience
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(self.run_parallel(scenarios))
-        finally:
-            loop.close()
+        return self.run_parallel_sync(scenarios)
 
 
 # Convenience functions
 async def debug_parallel(issue_type: str, scenarios: List[TestScenario],
-                        max_workers: int = 4) -> AggregatedResults:
+                        max_workers: int = 4) -> "AggregatedResults":
     """Run parallel debugging with default configuration."""
     debugger = ParallelDebugger(issue_type)
     return await debugger.run_parallel(scenarios, max_workers=max_workers)
 
 
-def debug_auth_issues() -> AggregatedResults:
+def debug_auth_issues() -> "AggregatedResults":
     """Debug authentication issues in parallel."""
     from parallel_config import get_auth_scenarios
     
     debugger = ParallelDebugger("auth-issues")
     debugger.config.add_scenarios(get_auth_scenarios())
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(debugger.run_parallel())
-    finally:
-        loop.close()
+    return debugger.run_parallel_sync()
 
 
-def debug_performance_issues() -> AggregatedResults:
+def debug_performance_issues() -> "AggregatedResults":
     """Debug performance issues in parallel."""
     from parallel_config import get_performance_scenarios
     
     debugger = ParallelDebugger("performance-issues")
     debugger.config.add_scenarios(get_performance_scenarios())
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(debugger.run_parallel())
-    finally:
-        loop.close()
+    return debugger.run_parallel_sync()
 
 
 # Example usage
@@ -5,11 +5,14 @@ Provides a terminal-based UI to track worker progress and status.
 """
 
 import os
+import re
 import sys
 import time
+import signal
+import bisect
 import threading
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from collections import defaultdict
 from queue import Queue, Empty
 import shutil
@@ -39,9 +42,58 @@ class Colors:
     
     # Cursor control
     CLEAR_LINE = '\033[2K'
+    CLEAR_SCREEN = '\033[2J'
     MOVE_UP = '\033[1A'
     HIDE_CURSOR = '\033[?25l'
     SHOW_CURSOR = '\033[?25h'
+    
+    # Synchronized output (DEC mode 2026): the terminal presents the frame at once
+    BEGIN_SYNC = '\033[?2026h'
+    END_SYNC = '\033[?2026l'
+
+
+def _supports_synchronized_output() -> bool:
+    """Whether to bracket frames in synchronized-output mode.
+    
+    Terminals that don't know mode 2026 ignore it, so it is only skipped for
+    terminals without escape-sequence support at all.
+    """
+    return os.environ.get('TERM', 'dumb') not in ('dumb', 'linux', 'unknown')
+
+
+# Icon and color for each worker status
+STATUS_ICONS = {
+    "pending": "⏳",
+    "starting": "",
+    "running": "",
+    "executing": "",
+    "completed": "",
+    "failed": "",
+    "cleanup": ""
+}
+
+STATUS_COLORS = {
+    "pending": Colors.DIM,
+    "starting": Colors.CYAN,
+    "running": Colors.BLUE,
+    "executing": Colors.YELLOW,
+    "completed": Colors.GREEN,
+    "failed": Colors.RED,
+    "cleanup": Colors.DIM
+}
+
+# Progress bar glyphs
+PROGRESS_FILLED = ''
+PROGRESS_EMPTY = ''
+
+# Statuses counted as running; their elapsed time keeps advancing
+ACTIVE_STATUSES = ('starting', 'running', 'executing')
+
+# Upper bound on dashboard refreshes per second
+MAX_FPS = 30
+
+# Matches ANSI escape sequences, for measuring visible text width
+_ANSI_RE = re.compile(r'\x1b\[[0-9;?]*[a-zA-Z]')
 
 
 class WorkerStatus:
@@ -52,57 +104,53 @@ class WorkerStatus:
         self.scenario_name = scenario_name
         self.status = "pending"
         self.message = "Waiting to start"
-        self.start_time = None
-        self.last_update = datetime.now()
+        self.icon = STATUS_ICONS["pending"]
+        self.color = STATUS_COLORS["pending"]
+        # Monotonic timestamps (time.monotonic())
+        self.start_time: Optional[float] = None
+        self.last_update = time.monotonic()
         self.progress_steps = []
         self.error = None
+        # Bumped on every update so rendered lines can be cached
+        self.version = 0
+        # Formatted elapsed time and when it next changes
+        self._elapsed_str = "0:00"
+        self._elapsed_expires = 0.0
     
     def update(self, status: str, message: str):
         """Update worker status."""
         self.status = status
         self.message = message
-        self.last_update = datetime.now()
+        self.icon = STATUS_ICONS.get(status, "")
+        self.color = STATUS_COLORS.get(status, Colors.WHITE)
+        self.last_update = time.monotonic()
+        self.version += 1
         
-        if status == "starting" and not self.start_time:
-            self.start_time = datetime.now()
+        if status == "starting" and self.start_time is None:
+            self.start_time = self.last_update
         elif status == "failed":
             self.error = message
     
     def get_elapsed_time(self) -> str:
         """Get elapsed time since start."""
-        if not self.start_time:
+        if self.start_time is None:
             return "0:00"
         
-        elapsed = (datetime.now() - self.start_time).total_seconds()
-        minutes = int(elapsed // 60)
-        seconds = int(elapsed % 60)
-        return f"{minutes}:{seconds:02d}"
+        # The string only changes once per whole second, so reuse it until then
+        now = time.monotonic()
+        if now >= self._elapsed_expires:
+            elapsed = int(now - self.start_time)
+            self._elapsed_str = f"{elapsed // 60}:{elapsed % 60:02d}"
+            self._elapsed_expires = self.start_time + elapsed + 1
+        return self._elapsed_str
     
     def get_status_icon(self) -> str:
         """Get icon representing current status."""
-        icons = {
-            "pending": "⏳",
-            "starting": "",
-            "running": "",
-            "executing": "",
-            "completed": "",
-            "failed": "",
-            "cleanup": ""
-        }
-        return icons.get(self.status, "")
+        return self.icon
     
     def get_status_color(self) -> str:
         """Get color for current status."""
-        colors = {
-            "pending": Colors.DIM,
-            "starting": Colors.CYAN,
-            "running": Colors.BLUE,
-            "executing": Colors.YELLOW,
-            "completed": Colors.GREEN,
-            "failed": Colors.RED,
-            "cleanup": Colors.DIM
-        }
-        return colors.get(self.status, Colors.WHITE)
+        return self.color
 
 
 class ParallelMonitor:
@@ -111,13 +159,35 @@ class ParallelMonitor:
     def __init__(self, status_queue: Queue, scenarios: Dict[str, Any]):
         self.status_queue = status_queue
         self.scenarios = scenarios
+        # Only the status thread writes to workers; the display thread reads
+        # the snapshot it publishes after each update, so no lock is needed
         self.workers: Dict[str, WorkerStatus] = {}
+        # (sort key, worker) pairs kept in display order as statuses change
+        self._worker_order: List[Tuple[Tuple[bool, bool, str], WorkerStatus]] = []
+        self._snapshot: List[WorkerStatus] = []
+        # Number of workers in each status, kept up to date as statuses change
+        self._status_counts: Dict[str, int] = defaultdict(int)
         self.running = False
-        self.lock = threading.Lock()
         
         # Terminal settings
         self.term_width = shutil.get_terminal_size().columns
         self.term_height = shutil.get_terminal_size().lines
+        self._sync_output = _supports_synchronized_output()
+        self._build_static_fragments()
+        
+        # Frames go straight to stdout's file descriptor while stdout is unchanged
+        self._stdout = sys.stdout
+        try:
+            self._stdout_fd: Optional[int] = sys.stdout.fileno()
+        except (AttributeError, OSError, ValueError):
+            self._stdout_fd = None
+        
+        # Re-read the terminal size only when it actually changes. The handler
+        # just flags it; the display thread does the work before its next frame.
+        self._resized = False
+        self._prev_winch_handler = None
+        if hasattr(signal, 'SIGWINCH') and threading.current_thread() is threading.main_thread():
+            self._prev_winch_handler = signal.signal(signal.SIGWINCH, self._on_resize)
         
         # Statistics
         self.stats = {
@@ -128,7 +198,32 @@ class ParallelMonitor:
             'elapsed_time': 0
         }
         
-        self.start_time = datetime.now()
+        self.start_time = time.monotonic()
+        
+        # Rows of the frame being drawn and of the one currently on screen;
+        # only rows that differ are repainted
+        # Rows are (color, text): color is the SGR the whole row is drawn in,
+        # or None for rows that carry their own escape codes
+        self._frame: List[Tuple[Optional[str], str]] = []
+        self._prev_frame: List[Tuple[Optional[str], str]] = []
+        # Where the time fields sit in the frame on screen, for per-second ticks
+        self._stats_row: Optional[int] = None
+        self._worker_rows: List[Tuple[WorkerStatus, int, int]] = []
+        
+        # Rendered worker lines (and where their elapsed field starts) keyed by
+        # (version, elapsed, width), and the number of updates handled / already drawn
+        self._line_cache: Dict[str, Tuple[Tuple[int, str, int], str, int]] = {}
+        self._updates_handled = 0
+        self._updates_drawn = 0
+        self._last_drawn_second: Optional[int] = None
+        
+    def _build_static_fragments(self):
+        """Build the width-dependent strings reused by every frame."""
+        self._hr = "=" * self.term_width
+        self._rule = "-" * self.term_width
+        bar_width = max(0, self.term_width - 20)
+        self._bar_filled = PROGRESS_FILLED * bar_width
+        self._bar_empty = PROGRESS_EMPTY * bar_width
         
     def run(self):
         """Run the monitoring dashboard."""
@@ -145,10 +240,19 @@ class ParallelMonitor:
             status_thread = threading.Thread(target=self._process_status_updates, daemon=True)
             status_thread.start()
             
-            # Main display loop
+            # Main display loop; frames with nothing new are skipped by
+            # _update_display, so this only bounds how often changes are shown
+            frame_interval = 1.0 / MAX_FPS
+            next_frame = time.monotonic()
             while self.running:
                 self._update_display()
-                time.sleep(0.5)  # Update every 500ms
+                next_frame += frame_interval
+                delay = next_frame - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # Fell behind; don't try to catch up with a burst of frames
+                    next_frame = time.monotonic()
                 
         except KeyboardInterrupt:
             pass
@@ -161,72 +265,259 @@ class ParallelMonitor:
     def stop(self):
         """Stop the monitor."""
         self.running = False
+        # Wake the status thread, which blocks on the queue
+        try:
+            self.status_queue.put(None)
+        except Exception:
+            pass
+        
+        # Restore the resize handler we replaced
+        if self._prev_winch_handler is not None and threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGWINCH, self._prev_winch_handler)
+            self._prev_winch_handler = None
+    
+    def _on_resize(self, signum, frame):
+        """SIGWINCH handler: note that the terminal size changed."""
+        self._resized = True
+    
+    def _apply_resize(self):
+        """Pick up the new terminal size and rebuild everything sized to it."""
+        size = shutil.get_terminal_size()
+        self.term_width = size.columns
+        self.term_height = size.lines
+        self._build_static_fragments()
+        self._line_cache.clear()
+        # Old rows may have wrapped; repaint the whole screen
+        self._prev_frame = []
     
     def _process_status_updates(self):
-        """Process status updates from workers."""
+        """Process status updates from workers until a None sentinel arrives."""
         while self.running:
             try:
-                update = self.status_queue.get(timeout=0.1)
-                self._handle_status_update(update)
-            except Empty:
-                continue
+                update = self.status_queue.get()
+                if update is None:
+                    break
+                
+                # Drain the rest of a burst so it is applied in one go
+                batch = [update]
+                stopping = False
+                while True:
+                    try:
+                        update = self.status_queue.get_nowait()
+                    except Empty:
+                        break
+                    if update is None:
+                        stopping = True
+                        break
+                    batch.append(update)
+                
+                self._handle_status_updates(batch)
+                if stopping:
+                    break
             except Exception as e:
                 print(f"Error processing status: {e}")
     
     def _handle_status_update(self, update: Dict[str, Any]):
         """Handle a status update from a worker."""
-        with self.lock:
-            worker_id = update.get('worker_id')
-            scenario = update.get('scenario')
-            status = update.get('status')
-            message = update.get('message', '')
-            
-            # Create or update worker status
-            if worker_id not in self.workers:
-                self.workers[worker_id] = WorkerStatus(worker_id, scenario)
-            
-            worker = self.workers[worker_id]
-            worker.update(status, message)
-            
-            # Update statistics
-            self._update_stats()
+        self._handle_status_updates([update])
+    
+    def _handle_status_updates(self, updates: List[Dict[str, Any]]):
+        """Apply a batch of status updates, then refresh statistics once."""
+        for update in updates:
+            self._apply_status_update(update)
+        
+        # Update statistics and publish the new state to the display thread
+        self._update_stats()
+        self._snapshot = [worker for _, worker in self._worker_order]
+        self._updates_handled += 1
+    
+    def _apply_status_update(self, update: Dict[str, Any]):
+        """Apply a single status update to its worker."""
+        worker_id = update.get('worker_id')
+        scenario = update.get('scenario')
+        status = update.get('status')
+        message = update.get('message', '')
+        
+        # Create or update worker status
+        worker = self.workers.get(worker_id)
+        if worker is None:
+            worker = self.workers[worker_id] = WorkerStatus(worker_id, scenario)
+            old_key = None
+        else:
+            old_key = self._sort_key(worker)
+            self._status_counts[worker.status] -= 1
+        
+        worker.update(status, message)
+        self._status_counts[worker.status] += 1
+        
+        # Move the worker within the display order only if its position changed
+        new_key = self._sort_key(worker)
+        if new_key != old_key:
+            if old_key is not None:
+                # Keys are unique (they end in worker_id), so (key,) sorts just before its entry
+                del self._worker_order[bisect.bisect_left(self._worker_order, (old_key,))]
+            bisect.insort(self._worker_order, (new_key, worker))
+    
+    @staticmethod
+    def _sort_key(worker: WorkerStatus) -> Tuple[bool, bool, str]:
+        """Display order: running first, then completed, then failed."""
+        return (
+            worker.status == 'completed',
+            worker.status == 'failed',
+            worker.worker_id
+        )
     
     def _update_stats(self):
         """Update execution statistics."""
-        self.stats['completed'] = sum(1 for w in self.workers.values() 
-                                     if w.status == 'completed')
-        self.stats['failed'] = sum(1 for w in self.workers.values() 
-                                  if w.status == 'failed')
-        self.stats['running'] = sum(1 for w in self.workers.values() 
-                                   if w.status in ['starting', 'running', 'executing'])
+        # Build a new dict so the display thread never sees a half-updated one
+        stats = dict(self.stats)
+        counts = self._status_counts
+        stats['completed'] = counts['completed']
+        stats['failed'] = counts['failed']
+        stats['running'] = sum(counts[status] for status in ACTIVE_STATUSES)
         
-        elapsed = (datetime.now() - self.start_time).total_seconds()
-        self.stats['elapsed_time'] = elapsed
+        elapsed = time.monotonic() - self.start_time
+        stats['elapsed_time'] = elapsed
+        self.stats = stats
     
     def _update_display(self):
         """Update the terminal display."""
-        # Move cursor to top
-        print('\033[H', end='')
+        resized = self._resized
+        if resized:
+            self._resized = False
+            self._apply_resize()
         
-        # Clear and redraw
+        # Without new status updates only the time fields can change, and only
+        # once a displayed second ticks over. The first refresh always draws a
+        # full frame, before any update has arrived.
+        second = int(time.monotonic() - self.start_time)
+        updates = self._updates_handled
+        if not resized and updates == self._updates_drawn and self._stats_row is not None:
+            if second != self._last_drawn_second:
+                self._last_drawn_second = second
+                self._tick_elapsed()
+            return
+        self._updates_drawn = updates
+        self._last_drawn_second = second
+        
+        # Draw the new frame off-screen
+        self._frame = []
+        self._worker_rows = []
         self._draw_header()
         self._draw_progress_bar()
         self._draw_workers()
         self._draw_footer()
         
-        # Flush output
-        sys.stdout.flush()
+        # Repaint changed rows in place. SGR state survives cursor moves, so a
+        # color is only (re)set when it differs from the previous painted row.
+        prev = self._prev_frame
+        out = []
+        active = None
+        for row, (color, line) in enumerate(self._frame):
+            if row < len(prev) and prev[row] == (color, line):
+                continue
+            if color != active:
+                if active:
+                    out.append(Colors.RESET)
+                if color:
+                    out.append(color)
+                active = color
+            out.append(f"\033[{row + 1};1H{Colors.CLEAR_LINE}{line}")
+        if active:
+            out.append(Colors.RESET)
+        
+        # Blank rows the new frame no longer uses
+        out.extend(
+            f"\033[{row + 1};1H{Colors.CLEAR_LINE}"
+            for row in range(len(self._frame), len(prev))
+        )
+        self._prev_frame = self._frame
+        
+        if resized:
+            out.insert(0, Colors.CLEAR_SCREEN)
+        
+        self._flush_output(out)
+    
+    def _tick_elapsed(self):
+        """Repaint just the time fields that advance between status updates."""
+        out = []
+        
+        # The stats line is redrawn whole, since the time can change its width
+        if self._stats_row is not None:
+            stats_line = self._format_stats_line()
+            self._prev_frame[self._stats_row] = (None, stats_line)
+            out.append(f"\033[{self._stats_row + 1};1H{Colors.CLEAR_LINE}{stats_line}")
+        
+        # Patch the elapsed field of running workers into the rows on screen, so
+        # the previous frame keeps matching the terminal for the next diff
+        for worker, row, start in self._worker_rows:
+            if worker.status not in ACTIVE_STATUSES:
+                continue
+            color, line = self._prev_frame[row]
+            end = line.index(']', start)
+            field = f"{worker.get_elapsed_time():>5}"
+            if line[start:end] == field:
+                continue
+            
+            self._prev_frame[row] = (color, line[:start] + field + line[end:])
+            if end - start == len(field):
+                out.append(f"\033[{row + 1};{start + 1}H{color}{field}{Colors.RESET}")
+            else:
+                out.append(f"\033[{row + 1};1H{Colors.CLEAR_LINE}{color}{self._prev_frame[row][1]}{Colors.RESET}")
+        
+        self._flush_output(out)
+    
+    def _flush_output(self, out: List[str]):
+        """Emit pending terminal output with a single write."""
+        if out:
+            if self._sync_output:
+                out.insert(0, Colors.BEGIN_SYNC)
+                out.append(Colors.END_SYNC)
+            self._write_frame(''.join(out))
+    
+    def _write_frame(self, data: str):
+        """Write frame output, encoding it once and bypassing the text layer when possible."""
+        stream = sys.stdout
+        if self._stdout_fd is not None and stream is self._stdout:
+            # Flush pending text first so output from other threads stays in order
+            stream.flush()
+            view = memoryview(data.encode(stream.encoding or 'utf-8', stream.errors or 'strict'))
+            while view:
+                view = view[os.write(self._stdout_fd, view):]
+            return
+        
+        buffer = getattr(stream, 'buffer', None)
+        if buffer is None:
+            stream.write(data)
+            stream.flush()
+            return
+        
+        # Flush pending text first so output from other threads stays in order
+        stream.flush()
+        buffer.write(data.encode(stream.encoding or 'utf-8', stream.errors or 'strict'))
+        buffer.flush()
+    
+    def _emit(self, line: str = '', color: Optional[str] = None):
+        """Append a row to the frame being drawn, optionally all in one color."""
+        self._frame.append((color, line))
     
     def _draw_header(self):
         """Draw the header section."""
         # Title
         title = " PARALLEL DEBUG MONITOR "
         padding = (self.term_width - len(title)) // 2
-        print(f"{Colors.BOLD}{Colors.CYAN}{' ' * padding}{title}{' ' * padding}{Colors.RESET}")
-        print("=" * self.term_width)
+        self._emit(f"{Colors.BOLD}{Colors.CYAN}{' ' * padding}{title}{' ' * padding}{Colors.RESET}")
+        self._emit(self._hr)
         
         # Statistics
-        elapsed = int(self.stats['elapsed_time'])
+        self._stats_row = len(self._frame)
+        self._emit(self._format_stats_line())
+        self._emit(self._hr)
+        self._emit()
+    
+    def _format_stats_line(self) -> str:
+        """Format the centred statistics line."""
+        elapsed = int(time.monotonic() - self.start_time)
         elapsed_str = f"{elapsed // 60}:{elapsed % 60:02d}"
         
         stats_line = (
@@ -239,15 +530,9 @@ class ParallelMonitor:
         
         # Center the stats line
         # Account for ANSI codes when calculating padding
-        visible_length = (
-            len(f"Total: {self.stats['total']} | Completed: {self.stats['completed']} | "
-                f"Failed: {self.stats['failed']} | Running: {self.stats['running']} | "
-                f"Time: {elapsed_str}")
-        )
+        visible_length = len(_ANSI_RE.sub('', stats_line))
         padding = (self.term_width - visible_length) // 2
-        print(f"{' ' * padding}{stats_line}")
-        print("=" * self.term_width)
-        print()
+        return f"{' ' * padding}{stats_line}"
     
     def _draw_progress_bar(self):
         """Draw overall progress bar."""
@@ -264,8 +549,8 @@ class ParallelMonitor:
         filled = int(bar_width * progress)
         empty = bar_width - filled
         
-        # Create progress bar
-        bar = f"[{'' * filled}{'' * empty}] {progress*100:.1f}%"
+        # Create progress bar from the prebuilt full-width pieces
+        bar = f"[{self._bar_filled[:filled]}{self._bar_empty[:empty]}] {progress*100:.1f}%"
         
         # Color based on status
         if self.stats['failed'] > 0:
@@ -275,23 +560,16 @@ class ParallelMonitor:
         else:
             color = Colors.BLUE
         
-        print(f"{color}{bar}{Colors.RESET}")
-        print()
+        self._emit(f"{color}{bar}{Colors.RESET}")
+        self._emit()
     
     def _draw_workers(self):
         """Draw worker status list."""
-        print(f"{Colors.BOLD}WORKER STATUS:{Colors.RESET}")
-        print("-" * self.term_width)
-        
-        # Sort workers by status (running first, then completed, then failed)
-        sorted_workers = sorted(
-            self.workers.values(),
-            key=lambda w: (
-                w.status == 'completed',
-                w.status == 'failed',
-                w.worker_id
-            )
-        )
+        self._emit(f"{Colors.BOLD}WORKER STATUS:{Colors.RESET}")
+        self._emit(self._rule)
+        
+        # Workers are kept sorted by the status thread
+        sorted_workers = self._snapshot
         
         # Display each worker
         for worker in sorted_workers:
@@ -301,13 +579,21 @@ class ParallelMonitor:
         displayed = len(sorted_workers)
         remaining_lines = max(0, self.term_height - 15 - displayed)
         for _ in range(remaining_lines):
-            print(Colors.CLEAR_LINE)
+            self._emit()
     
     def _draw_worker_line(self, worker: WorkerStatus):
         """Draw a single worker status line."""
+        elapsed = worker.get_elapsed_time()
+        key = (worker.version, elapsed, self.term_width)
+        cached = self._line_cache.get(worker.worker_id)
+        if cached and cached[0] == key:
+            self._worker_rows.append((worker, len(self._frame), cached[2]))
+            self._emit(cached[1], worker.color)
+            return
+        
         # Format components
-        icon = worker.get_status_icon()
-        color = worker.get_status_color()
+        icon = worker.icon
+        color = worker.color
         
         # Truncate scenario name if needed
         max_scenario_len = 30
@@ -321,22 +607,28 @@ class ParallelMonitor:
         if len(worker.message) > max_message_len:
             message += "..."
         
-        # Build line
-        line = (
-            f"{color}{icon} {worker.worker_id:<12} "
-            f"{scenario:<35} "
-            f"[{worker.get_elapsed_time():>5}] "
-            f"{message}{Colors.RESET}"
-        )
+        # Build line; its color is applied when the row is painted
+        prefix = f"{icon} {worker.worker_id:<12} {scenario:<35} ["
+        line = f"{prefix}{elapsed:>5}] {message}"
         
-        # Clear line and print
-        print(f"{Colors.CLEAR_LINE}{line}")
+        self._line_cache[worker.worker_id] = (key, line, len(prefix))
+        self._worker_rows.append((worker, len(self._frame), len(prefix)))
+        self._emit(line, color)
     
     def _draw_footer(self):
         """Draw the footer section."""
-        print()
-        print("=" * self.term_width)
-        print(f"{Colors.DIM}Press Ctrl+C to stop monitoring{Colors.RESET}")
+        self._emit()
+        self._emit(self._hr)
+        self._emit(f"{Colors.DIM}Press Ctrl+C to stop monitoring{Colors.RESET}")
+
+
+# Icons used by SimpleMonitor's line output
+SIMPLE_STATUS_ICONS = {
+    "starting": "",
+    "running": "",
+    "completed": "",
+    "failed": ""
+}
 
 
 # Simple console monitor for non-terminal environments
@@ -357,8 +649,14 @@ class SimpleMonitor:
         
         while self.running:
             try:
-                update = self.status_queue.get(timeout=1)
-                self._print_update(update)
+                batch = [self.status_queue.get(timeout=1)]
+                # Drain the rest of a burst so it is written in one go
+                while True:
+                    try:
+                        batch.append(self.status_queue.get_nowait())
+                    except Empty:
+                        break
+                self._print_updates(batch)
             except Empty:
                 continue
             except KeyboardInterrupt:
@@ -370,22 +668,26 @@ class SimpleMonitor:
     
     def _print_update(self, update: Dict[str, Any]):
         """Print a status update."""
+        self._print_updates([update])
+    
+    def _print_updates(self, updates: List[Dict[str, Any]]):
+        """Print a batch of status updates with a single write."""
+        timestamp = datetime.now().strftime('%H:%M:%S')
+        lines = [self._format_update(update, timestamp) for update in updates]
+        sys.stdout.write(''.join(lines))
+        sys.stdout.flush()
+    
+    def _format_update(self, update: Dict[str, Any], timestamp: str) -> str:
+        """Format a status update as an output line."""
         worker_id = update.get('worker_id')
         scenario = update.get('scenario')
         status = update.get('status')
         message = update.get('message', '')
-        timestamp = datetime.now().strftime('%H:%M:%S')
         
         # Get status icon
-        icons = {
-            "starting": "",
-            "running": "",
-            "completed": "",
-            "failed": ""
-        }
-        icon = icons.get(status, "ℹ")
+        icon = SIMPLE_STATUS_ICONS.get(status, "ℹ")
         
-        print(f"[{timestamp}] {icon} {worker_id}: {scenario} - {message}")
+        return f"[{timestamp}] {icon} {worker_id}: {scenario} - {message}\n"
 
 
 # Factory function to create appropriate monitor
@@ -12,34 +12,179 @@ Sources include:
 import json
 import os
 import re
+import string
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
-import glob
+from itertools import islice
 
 from failure_pattern_db import FailurePatternDB, Solution, CodeChange
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+_BASE = Path(__file__).parent
+_DEFAULT_PATTERNS_FILE = _BASE / 'patterns' / 'error_patterns.json'
+_DEFAULT_SESSIONS_DIR = _BASE / 'sessions'
+
+# Compiled once at import; these run for every pattern and finding
+_WORD_RE = re.compile(r'[a-zA-Z_]{3,}')
+_KEYWORD_RE = re.compile(r'\b[a-zA-Z_]{4,}\b')
+_FILEREF_RE = re.compile(r'[a-zA-Z0-9_/]+\.[a-zA-Z]{2,4}')
+_TESTREF_RE = re.compile(r'test_[a-zA-Z0-9_]+')
+
+# File path -> module hint. Each branch scans the whole path, so 'api'
+# anywhere wins over 'component'/'pages', which win over 'lambda'.
+_MODULE_HINT_RE = re.compile(r'(?s)(?:.*?(api)|.*?(component|pages)|.*?(lambda))')
+_MODULE_HINT_GROUPS = (None, 'api', 'ui', 'lambda')
+
+# ASCII-only lowercasing: _WORD_RE only matches ASCII letters, and unlike
+# str.lower() this can't turn non-ASCII characters into new matches
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+_STOP_WORDS = frozenset({'does', 'not', 'exist', 'error', 'failed', 'cannot', 'invalid'})
+
+# Category keyword -> module hints, checked in order (first match wins)
+_CATEGORY_MODULES = (
+    ('database', ('database', 'migration', 'schema')),
+    ('sql', ('database', 'migration', 'schema')),
+    ('api', ('api', 'routes', 'middleware')),
+    ('auth', ('auth', 'login', 'session')),
+    ('react', ('ui', 'component', 'react')),
+    ('lambda', ('lambda', 'serverless', 'aws')),
+    ('file', ('filesystem', 'io')),
+)
+
+_REPORT_TEMPLATE = "\n".join([
+    "=" * 60,
+    "PATTERN IMPORT REPORT",
+    "=" * 60,
+    "Generated: {generated}",
+    "",
+    "SUMMARY",
+    "-" * 30,
+    "Patterns imported: {patterns_imported}",
+    "Sessions processed: {sessions_processed}",
+    "Solutions created: {solutions_created}",
+    "Errors encountered: {error_count}",
+    "",
+    "DATABASE STATUS",
+    "-" * 30,
+    "Total patterns: {total_patterns}",
+    "Total solutions: {total_solutions}",
+    "Success rate: {average_success_rate:.1%}",
+    "",
+    "PATTERNS BY TYPE",
+    "-" * 30,
+    "{by_type}",
+    "{errors}" + "=" * 60,
+])
+
+# Session files are small and numerous; read several at once
+SESSION_READ_WORKERS = 8
+
+
+def _unique(items):
+    """Yield items in order, skipping any already yielded."""
+    seen = set()
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            yield item
+
+
+def _find_session_files(sessions_dir) -> List[str]:
+    """List flat <id>.json session files, then <id>/state.json ones, in one scan."""
+    flat_files = []
+    state_files = []
+    try:
+        with os.scandir(sessions_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                if entry.name.endswith('.json') and entry.is_file():
+                    flat_files.append(entry.path)
+                elif entry.is_dir():
+                    state_file = os.path.join(entry.path, 'state.json')
+                    if os.path.isfile(state_file):
+                        state_files.append(state_file)
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    return flat_files + state_files
+
+
+def _read_file_bytes(path: str) -> bytes:
+    """Read a whole file with one sized read instead of buffered text I/O."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        data = os.read(fd, os.fstat(fd).st_size)
+        # Short read, or the file grew since fstat
+        while True:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                return data
+            data += chunk
+    finally:
+        os.close(fd)
+
+
+# The only top-level session keys the importer reads
+_SESSION_KEYS = ('session_id', 'findings', 'test_data', 'checkpoints')
+
+
+def _load_session_file(session_file: str):
+    """Load one session file, returning (data, None) or (None, exception).
+
+    Only the keys in _SESSION_KEYS are kept, so the rest of each document
+    can be freed while the other files are still being read.
+    """
+    try:
+        session_data = _json_loads(_read_file_bytes(session_file))
+        if isinstance(session_data, dict):
+            session_data = {key: session_data[key] for key in _SESSION_KEYS if key in session_data}
+        return session_data, None
+    except Exception as e:
+        return None, e
+
 
 class PatternImporter:
     """Import patterns from various sources."""
     
     def __init__(self, pattern_db: Optional[FailurePatternDB] = None):
-        self.base_path = Path(__file__).parent
+        self.base_path = _BASE
         self.pattern_db = pattern_db or FailurePatternDB()
         self.import_stats = {
             'patterns_imported': 0,
             'sessions_processed': 0,
             'solutions_created': 0,
-            'errors': []
+            'errors': []  # (kind, source path or None, exception), formatted in the report
         }
+        # Signature -> pattern ID, for skipping repeat similarity searches
+        self._recorded_signatures: Dict[tuple, str] = {}
+    
+    @contextmanager
+    def batch(self):
+        """Defer pattern DB writes inside the block and save once on exit."""
+        pattern_db = self.pattern_db
+        already_deferred = pattern_db._defer_saves
+        pattern_db._defer_saves = True
+        try:
+            yield self
+        finally:
+            pattern_db._defer_saves = already_deferred
+            if not already_deferred:
+                pattern_db._save_database()
     
     def import_from_error_patterns(self, patterns_file: Optional[str] = None):
         """Import from existing error_patterns.json file."""
-        patterns_file = patterns_file or self.base_path / 'patterns' / 'error_patterns.json'
+        patterns_file = patterns_file or _DEFAULT_PATTERNS_FILE
         
         try:
-            with open(patterns_file, 'r') as f:
-                error_patterns = json.load(f)
+            error_patterns = _json_loads(_read_file_bytes(patterns_file))
             
             for category_key, category_data in error_patterns.items():
                 if not isinstance(category_data, dict):
@@ -74,7 +219,7 @@ class PatternImporter:
                                 'diff_snippet': suggestion
                             })
                     
-                    pattern_id = self.pattern_db.record_pattern(
+                    pattern_id = self._record_pattern(
                         pattern_signature,
                         solution,
                         session_id='import_error_patterns'
@@ -87,20 +232,24 @@ class PatternImporter:
                     self.import_stats['patterns_imported'] += 1
                 
         except Exception as e:
-            self.import_stats['errors'].append(f"Error importing error patterns: {str(e)}")
+            self.import_stats['errors'].append(('error patterns', None, e))
     
     def import_from_sessions(self, sessions_dir: Optional[str] = None):
         """Import patterns from historical debugging sessions."""
-        sessions_dir = sessions_dir or self.base_path / 'sessions'
+        sessions_dir = sessions_dir or _DEFAULT_SESSIONS_DIR
+        
+        session_files = _find_session_files(sessions_dir)
+        if not session_files:
+            return
         
-        # Find all session JSON files
-        session_files = glob.glob(str(sessions_dir / '*.json'))
-        session_files.extend(glob.glob(str(sessions_dir / '*' / 'state.json')))
+        # Overlap the file reads; the records below stay on this thread
+        with ThreadPoolExecutor(max_workers=min(SESSION_READ_WORKERS, len(session_files))) as pool:
+            loaded = list(pool.map(_load_session_file, session_files))
         
-        for session_file in session_files:
+        for session_file, (session_data, load_error) in zip(session_files, loaded):
             try:
-                with open(session_file, 'r') as f:
-                    session_data = json.load(f)
+                if load_error is not None:
+                    raise load_error
                 
                 session_id = session_data.get('session_id', Path(session_file).stem)
                 
@@ -120,7 +269,7 @@ class PatternImporter:
                             }
                         
                         # Record pattern
-                        self.pattern_db.record_pattern(pattern_signature, solution, session_id)
+                        self._record_pattern(pattern_signature, solution, session_id)
                         
                         if solution:
                             self.import_stats['solutions_created'] += 1
@@ -132,12 +281,15 @@ class PatternImporter:
                 self.import_stats['sessions_processed'] += 1
                 
             except Exception as e:
-                self.import_stats['errors'].append(
-                    f"Error importing session {session_file}: {str(e)}"
-                )
+                self.import_stats['errors'].append(('session', session_file, e))
     
     def import_manual_patterns(self, patterns: List[Dict[str, Any]]):
         """Import manually defined patterns."""
+        record = self._record_pattern
+        errors = self.import_stats['errors']
+        patterns_imported = 0
+        solutions_created = 0
+        
         for pattern_def in patterns:
             try:
                 pattern_signature = {
@@ -162,56 +314,74 @@ class PatternImporter:
                         'test_cases': solution_def.get('test_cases', [])
                     }
                     
-                    self.pattern_db.record_pattern(
+                    record(
                         pattern_signature,
                         solution,
                         session_id=solution_def.get('session_id', 'manual_import')
                     )
                     
-                    self.import_stats['solutions_created'] += 1
+                    solutions_created += 1
                 
-                self.import_stats['patterns_imported'] += 1
+                patterns_imported += 1
                 
             except Exception as e:
-                self.import_stats['errors'].append(
-                    f"Error importing manual pattern: {str(e)}"
-                )
+                errors.append(('manual pattern', None, e))
+        
+        self.import_stats['patterns_imported'] += patterns_imported
+        self.import_stats['solutions_created'] += solutions_created
+    
+    def _record_pattern(self, pattern_signature: Dict[str, Any],
+                        solution: Optional[Dict[str, Any]] = None,
+                        session_id: Optional[str] = None) -> str:
+        """Record a pattern, reusing the earlier match for a repeated signature.
+        
+        Only solution-less repeats take the shortcut; anything carrying a
+        solution still goes through record_pattern so it gets attached.
+        """
+        key = (
+            pattern_signature.get('error_type', 'Unknown'),
+            pattern_signature.get('error_message', ''),
+            tuple(pattern_signature.get('context_keywords', ())),
+            tuple(pattern_signature.get('module_hints', ()))
+        )
+        
+        if solution is None:
+            pattern_id = self._recorded_signatures.get(key)
+            if pattern_id is not None and self.pattern_db.record_occurrence(pattern_id):
+                return pattern_id
+        
+        pattern_id = self.pattern_db.record_pattern(pattern_signature, solution, session_id)
+        self._recorded_signatures[key] = pattern_id
+        return pattern_id
     
     def _extract_keywords_from_patterns(self, patterns: List[str]) -> List[str]:
         """Extract meaningful keywords from regex patterns."""
-        keywords = set()
+        keywords = []
+        seen = set()
         
-        for pattern in patterns:
-            # Extract literal words from regex
-            words = re.findall(r'[a-zA-Z_]{3,}', pattern)
-            keywords.update(word.lower() for word in words if len(word) > 3)
+        # Lowercase everything in one pass; words never span the newlines
+        text = '\n'.join(patterns).translate(_ASCII_LOWER)
         
-        # Remove common words
-        stop_words = {'does', 'not', 'exist', 'error', 'failed', 'cannot', 'invalid'}
-        keywords = keywords - stop_words
+        # Extract literal words from regex, skipping common words
+        for match in _WORD_RE.finditer(text):
+            word = match.group()
+            if len(word) > 3 and word not in _STOP_WORDS and word not in seen:
+                seen.add(word)
+                keywords.append(word)
+                if len(keywords) == 10:  # Limit to 10 keywords
+                    return keywords
         
-        return list(keywords)[:10]  # Limit to 10 keywords
+        return keywords
     
     def _infer_modules_from_category(self, category_key: str) -> List[str]:
         """Infer module hints from category name."""
-        modules = []
-        
         category_lower = category_key.lower()
         
-        if 'database' in category_lower or 'sql' in category_lower:
-            modules.extend(['database', 'migration', 'schema'])
-        elif 'api' in category_lower:
-            modules.extend(['api', 'routes', 'middleware'])
-        elif 'auth' in category_lower:
-            modules.extend(['auth', 'login', 'session'])
-        elif 'react' in category_lower:
-            modules.extend(['ui', 'component', 'react'])
-        elif 'lambda' in category_lower:
-            modules.extend(['lambda', 'serverless', 'aws'])
-        elif 'file' in category_lower:
-            modules.extend(['filesystem', 'io'])
+        for keyword, modules in _CATEGORY_MODULES:
+            if keyword in category_lower:
+                return list(modules)
         
-        return modules
+        return []
     
     def _extract_pattern_from_finding(self, finding: Dict[str, Any]) -> Dict[str, Any]:
         """Extract pattern signature from a session finding."""
@@ -231,19 +401,18 @@ class PatternImporter:
         
         # Extract keywords from evidence
         evidence = finding.get('evidence', '')
-        keywords = re.findall(r'\b[a-zA-Z_]{4,}\b', evidence.lower())
+        keywords = _KEYWORD_RE.findall(evidence.lower())
         keywords = [kw for kw in keywords if len(kw) < 20][:10]
         
         # Infer modules
         modules = []
         related_files = finding.get('related_files', [])
         for file_path in related_files:
-            if 'api' in file_path:
-                modules.append('api')
-            elif 'component' in file_path or 'pages' in file_path:
-                modules.append('ui')
-            elif 'lambda' in file_path:
-                modules.append('lambda')
+            match = _MODULE_HINT_RE.match(file_path)
+            if match:
+                module = _MODULE_HINT_GROUPS[match.lastindex]
+                if module not in modules:
+                    modules.append(module)
         
         return {
             'error_type': error_type,
@@ -258,7 +427,7 @@ class PatternImporter:
         
         # Look for file references in fix suggestion
         fix_suggestion = finding.get('fix_suggestion', '')
-        file_refs = re.findall(r'[a-zA-Z0-9_/]+\.[a-zA-Z]{2,4}', fix_suggestion)
+        file_refs = _FILEREF_RE.findall(fix_suggestion)
         
         for file_ref in file_refs:
             changes.append({
@@ -268,8 +437,10 @@ class PatternImporter:
             })
         
         # Also check related files
+        seen_paths = set(file_refs)
         for file_path in finding.get('related_files', []):
-            if not any(c['file_path'] == file_path for c in changes):
+            if file_path not in seen_paths:
+                seen_paths.add(file_path)
                 changes.append({
                     'file_path': file_path,
                     'description': 'Related file in fix',
@@ -279,26 +450,27 @@ class PatternImporter:
         return changes
     
     def _extract_test_cases_from_session(self, session_data: Dict[str, Any]) -> List[str]:
-        """Extract test cases mentioned in session."""
-        test_cases = []
-        
+        """Extract test cases mentioned in session, in the order they appear."""
+        return list(islice(_unique(self._iter_test_case_names(session_data)), 5))  # Limit to 5 test cases
+    
+    def _iter_test_case_names(self, session_data: Dict[str, Any]):
+        """Yield test names from test data, then test references in checkpoints."""
         # Check test data
         test_data = session_data.get('test_data', {})
         for category_data in test_data.values():
-            for test_name, test_info in category_data.items():
+            for test_name in category_data:
                 if 'test' in test_name:
-                    test_cases.append(test_name)
+                    yield test_name
         
         # Check checkpoints for test references
         for checkpoint in session_data.get('checkpoints', []):
             desc = checkpoint.get('description', '')
-            test_refs = re.findall(r'test_[a-zA-Z0-9_]+', desc)
-            test_cases.extend(test_refs)
-        
-        return list(set(test_cases))[:5]  # Limit to 5 test cases
+            for match in _TESTREF_RE.finditer(desc):
+                yield match.group()
     
     def _import_from_test_data(self, test_data: Dict[str, Any], session_id: str):
         """Import patterns from test execution data."""
+        record = self._record_pattern
         for category, tests in test_data.items():
             if not isinstance(tests, dict):
                 continue
@@ -318,57 +490,41 @@ class PatternImporter:
                                     'module_hints': [category]
                                 }
                                 
-                                self.pattern_db.record_pattern(
-                                    pattern_signature,
-                                    None,
-                                    session_id
-                                )
+                                record(pattern_signature, None, session_id)
     
     def generate_import_report(self) -> str:
         """Generate a report of the import process."""
-        report = []
-        report.append("=" * 60)
-        report.append("PATTERN IMPORT REPORT")
-        report.append("=" * 60)
-        report.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append("")
-        
-        report.append("SUMMARY")
-        report.append("-" * 30)
-        report.append(f"Patterns imported: {self.import_stats['patterns_imported']}")
-        report.append(f"Sessions processed: {self.import_stats['sessions_processed']}")
-        report.append(f"Solutions created: {self.import_stats['solutions_created']}")
-        report.append(f"Errors encountered: {len(self.import_stats['errors'])}")
-        report.append("")
-        
-        # Database stats
         db_stats = self.pattern_db.get_pattern_stats()
-        report.append("DATABASE STATUS")
-        report.append("-" * 30)
-        report.append(f"Total patterns: {db_stats['total_patterns']}")
-        report.append(f"Total solutions: {db_stats['total_solutions']}")
-        report.append(f"Success rate: {db_stats['average_success_rate']:.1%}")
-        report.append("")
+        errors = self.import_stats['errors']
         
         # Pattern breakdown
-        report.append("PATTERNS BY TYPE")
-        report.append("-" * 30)
-        for error_type, pattern_ids in db_stats['patterns_by_type'].items():
-            report.append(f"{error_type}: {len(pattern_ids)} patterns")
-        report.append("")
+        by_type = "".join(
+            f"{error_type}: {len(pattern_ids)} patterns\n"
+            for error_type, pattern_ids in db_stats['patterns_by_type'].items()
+        )
         
         # Errors
-        if self.import_stats['errors']:
-            report.append("ERRORS")
-            report.append("-" * 30)
-            for error in self.import_stats['errors'][:10]:
-                report.append(f"- {error}")
-            if len(self.import_stats['errors']) > 10:
-                report.append(f"... and {len(self.import_stats['errors']) - 10} more errors")
-        
-        report.append("=" * 60)
+        error_lines = []
+        if errors:
+            error_lines.append("ERRORS")
+            error_lines.append("-" * 30)
+            for kind, source, exc in errors[:10]:
+                if source:
+                    error_lines.append(f"- Error importing {kind} {source}: {exc}")
+                else:
+                    error_lines.append(f"- Error importing {kind}: {exc}")
+            if len(errors) > 10:
+                error_lines.append(f"... and {len(errors) - 10} more errors")
+            error_lines.append("")
         
-        return "\n".join(report)
+        return _REPORT_TEMPLATE.format_map({
+            **self.import_stats,
+            **db_stats,
+            'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'error_count': len(errors),
+            'by_type': by_type,
+            'errors': "\n".join(error_lines)
+        })
 
 
 def run_full_import():
@@ -377,23 +533,22 @@ def run_full_import():
     
     importer = PatternImporter()
     
-    # Import from error patterns
-    print("Importing from error_patterns.json...")
-    importer.import_from_error_patterns()
-    
-    # Import from sessions
-    print("Importing from debugging sessions...")
-    importer.import_from_sessions()
-    
-    # Save the database
-    importer.pattern_db._save_database()
+    # Save the database once, after both imports
+    with importer.batch():
+        # Import from error patterns
+        print("Importing from error_patterns.json...")
+        importer.import_from_error_patterns()
+        
+        # Import from sessions
+        print("Importing from debugging sessions...")
+        importer.import_from_sessions()
     
     # Generate report
     report = importer.generate_import_report()
     print("\n" + report)
     
     # Save report
-    report_path = Path(__file__).parent / 'import_report.txt'
+    report_path = _BASE / 'import_report.txt'
     with open(report_path, 'w') as f:
         f.write(report)
     
@@ -10,13 +10,58 @@ Provides advanced matching capabilities:
 """
 
 import re
-import difflib
 from typing import List, Dict, Tuple, Optional, Any
 from dataclasses import dataclass
 import numpy as np
-from collections import Counter
+from collections import Counter, defaultdict
+from functools import lru_cache
 import json
 
+try:
+    from rapidfuzz.fuzz import token_set_ratio as _token_set_ratio
+except ImportError:
+    _token_set_ratio = None
+
+# Fixed regexes, compiled once at import
+_WORD_RE = re.compile(r'[a-zA-Z_]+')
+_TOKEN_RE = re.compile(r'\b[a-zA-Z_]+\b')
+_STACK_TRACE_RE = re.compile(r'at\s+\w+\s*\(.*:\d+:\d+\)')
+_ERROR_CODE_RE = re.compile(r'\b[A-Z]+[_-]?[A-Z0-9]+\b')
+_HTTP_STATUS_RE = re.compile(r'\b[4-5]\d{2}\b')
+
+# 256-byte translate tables for splitting out _WORD_RE / _TOKEN_RE matches in
+# ASCII text without the regex engine. For _TOKEN_RE, digits become '#' so that
+# letter runs joined to digits (which have no word boundary) can be dropped.
+_WORD_CHARS = frozenset(b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_')
+_WORD_TRANS = bytes(c if c in _WORD_CHARS else 0x20 for c in range(256))
+_TOKEN_TRANS = bytes(
+    c if c in _WORD_CHARS else 0x23 if 0x30 <= c <= 0x39 else 0x20 for c in range(256)
+)
+
+
+@lru_cache(maxsize=500)
+def _compile_pattern(pattern: str, flags: int = 0) -> Optional[re.Pattern]:
+    """Compile a stored error pattern once; None if it isn't a valid regex."""
+    try:
+        return re.compile(pattern, flags)
+    except Exception:
+        return None
+
+
+def _find_words(text: str) -> List[str]:
+    """Same as _WORD_RE.findall(text), splitting ASCII text with bytes.translate."""
+    if text.isascii():
+        return text.encode().translate(_WORD_TRANS).decode().split()
+    return _WORD_RE.findall(text)
+
+
+def _find_tokens(text: str) -> List[str]:
+    """Same as _TOKEN_RE.findall(text), splitting ASCII text with bytes.translate."""
+    if text.isascii():
+        words = text.encode().translate(_TOKEN_TRANS).decode().split()
+        return [word for word in words if '#' not in word]
+    return _TOKEN_RE.findall(text)
+
 
 @dataclass
 class MatchResult:
@@ -31,47 +76,166 @@ class MatchResult:
     explanation: str
 
 
+def _similar_patterns(i: int, candidates, columns, threshold: float) -> List[int]:
+    """
+    Score pattern i against each candidate j and return those at or above threshold.
+    
+    Similarity is 0.4 for the same error type, plus the Jaccard overlap of
+    error-pattern words, keywords and module hints weighted 0.3, 0.2 and 0.1.
+    The set columns hold (bitmask, size) pairs from _interned_masks, so each
+    overlap is one AND and a popcount rather than a set intersection.
+    """
+    error_types, words, keywords, modules = columns
+    type1 = error_types[i]
+    words1, n_words1 = words[i]
+    keywords1, n_keywords1 = keywords[i]
+    modules1, n_modules1 = modules[i]
+    
+    similar = []
+    for j in candidates:
+        # Same error type gives high similarity
+        similarity = 0.4 if error_types[j] == type1 else 0
+        
+        # Compare error patterns
+        words2, n_words2 = words[j]
+        if n_words1 and n_words2:
+            shared = (words1 & words2).bit_count()
+            similarity += shared / (n_words1 + n_words2 - shared) * 0.3
+        
+        # Compare keywords
+        keywords2, n_keywords2 = keywords[j]
+        if n_keywords1 and n_keywords2:
+            shared = (keywords1 & keywords2).bit_count()
+            similarity += shared / (n_keywords1 + n_keywords2 - shared) * 0.2
+        
+        # Compare modules
+        modules2, n_modules2 = modules[j]
+        if n_modules1 and n_modules2:
+            shared = (modules1 & modules2).bit_count()
+            similarity += shared / (n_modules1 + n_modules2 - shared) * 0.1
+        
+        if similarity >= threshold:
+            similar.append(j)
+    
+    return similar
+
+
+def _interned_masks(sets: List[set]) -> List[Tuple[int, int]]:
+    """
+    Intern the members of each set to bit positions and return (bitmask, size) pairs.
+    
+    Positions come from one vocabulary shared by the whole list, so the size
+    of an intersection is the popcount of the AND of two masks.
+    """
+    vocab = {}
+    masks = []
+    for members in sets:
+        mask = 0
+        for member in members:
+            bit = vocab.get(member)
+            if bit is None:
+                bit = vocab[member] = len(vocab)
+            mask |= 1 << bit
+        masks.append((mask, len(members)))
+    return masks
+
+
+@dataclass
+class _ErrorFeatures:
+    """Pattern-independent features of one error, shared across patterns."""
+    message: str
+    lower: str
+    tokens: List[str]
+    token_set: set
+    all_text: str  # Lowercased error plus context values
+    module_lower: Optional[str]
+    action_score: Optional[float]
+    synonym_hits: set  # Synonym-table keywords with a synonym in all_text
+    keyword_hits: Dict[str, bool]  # Lowercased context keyword -> found in all_text
+    type_scores: Dict[str, float]  # Error type -> share of its indicators present
+    format_scores: List[float]
+    has_http_status: bool
+
+
+@dataclass
+class _PreparedPattern:
+    """Derived data for one pattern, reused across errors."""
+    error_type: Optional[str]
+    error_type_lower: str
+    # (regex source, compiled regex or None, fuzzy text or None, fuzzy tokens)
+    error_patterns: List[Tuple[str, Optional[re.Pattern], Optional[str], set]]
+    all_tokens: List[str]  # Tokens of every error pattern, duplicates kept
+    all_token_set: set
+    max_text_score: float  # Highest text similarity any error could score
+    context_keywords: List[Tuple[str, str]]  # (keyword, lowercased keyword)
+    module_hints_lower: List[str]
+    # Used when comparing patterns with each other
+    pattern_words: set
+    keyword_set: set
+    module_set: set
+
+
+# Prepared patterns kept per matcher before the cache is reset
+_PREPARED_CACHE_SIZE = 4096
+
+
 class PatternMatcher:
     """Advanced pattern matching engine."""
     
+    # Common programming terms for better matching
+    stop_words = frozenset({
+        'the', 'is', 'at', 'which', 'on', 'a', 'an', 'and', 'or', 'but',
+        'in', 'with', 'to', 'for', 'of', 'as', 'by', 'be', 'been', 'being',
+        'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+        'should', 'may', 'might', 'must', 'shall', 'can', 'cannot'
+    })
+    
+    # Technical synonyms for better matching
+    synonyms = {
+        'error': ['exception', 'fault', 'failure', 'issue', 'problem'],
+        'null': ['undefined', 'none', 'nil', 'empty', 'missing'],
+        'invalid': ['incorrect', 'wrong', 'bad', 'illegal', 'malformed'],
+        'timeout': ['timed out', 'exceeded', 'deadline', 'expired'],
+        'permission': ['access', 'authorization', 'privilege', 'rights'],
+        'connection': ['connect', 'network', 'socket', 'communication'],
+        'database': ['db', 'sql', 'query', 'table', 'schema'],
+        'api': ['endpoint', 'route', 'service', 'rest', 'http'],
+        'authentication': ['auth', 'login', 'credential', 'token', 'session']
+    }
+    
+    # Error category weights for scoring
+    category_weights = {
+        'Database': 1.2,      # Database errors often have clear patterns
+        'API': 1.1,          # API errors are well-structured
+        'Authentication': 1.1,
+        'Null Reference': 1.0,
+        'Timeout': 0.9,      # Timeouts can be generic
+        'File System': 1.0,
+        'Lambda': 1.1,
+        'React': 1.0,
+        'Build/Compilation': 1.2,  # Build errors are very specific
+        'Performance': 0.8   # Performance issues are often vague
+    }
+    
+    # Type-specific indicators looked for in error messages
+    type_indicators = {
+        'database': ['sql', 'table', 'column', 'relation', 'query', 'database'],
+        'api': ['request', 'response', 'endpoint', 'http', '404', '401', '500'],
+        'null reference': ['null', 'undefined', 'cannot read', 'property'],
+        'authentication': ['auth', 'token', 'login', 'credential', 'unauthorized'],
+        'timeout': ['timeout', 'exceeded', 'timed out', 'deadline'],
+        'lambda': ['lambda', 'function', 'aws', 'invoke', 'serverless'],
+        'react': ['react', 'component', 'render', 'hook', 'state'],
+        'file system': ['file', 'directory', 'path', 'permission', 'enoent']
+    }
+    
     def __init__(self):
-        # Common programming terms for better matching
-        self.stop_words = {
-            'the', 'is', 'at', 'which', 'on', 'a', 'an', 'and', 'or', 'but',
-            'in', 'with', 'to', 'for', 'of', 'as', 'by', 'be', 'been', 'being',
-            'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
-            'should', 'may', 'might', 'must', 'shall', 'can', 'cannot'
-        }
-        
-        # Technical synonyms for better matching
-        self.synonyms = {
-            'error': ['exception', 'fault', 'failure', 'issue', 'problem'],
-            'null': ['undefined', 'none', 'nil', 'empty', 'missing'],
-            'invalid': ['incorrect', 'wrong', 'bad', 'illegal', 'malformed'],
-            'timeout': ['timed out', 'exceeded', 'deadline', 'expired'],
-            'permission': ['access', 'authorization', 'privilege', 'rights'],
-            'connection': ['connect', 'network', 'socket', 'communication'],
-            'database': ['db', 'sql', 'query', 'table', 'schema'],
-            'api': ['endpoint', 'route', 'service', 'rest', 'http'],
-            'authentication': ['auth', 'login', 'credential', 'token', 'session']
-        }
-        
-        # Error category weights for scoring
-        self.category_weights = {
-            'Database': 1.2,      # Database errors often have clear patterns
-            'API': 1.1,          # API errors are well-structured
-            'Authentication': 1.1,
-            'Null Reference': 1.0,
-            'Timeout': 0.9,      # Timeouts can be generic
-            'File System': 1.0,
-            'Lambda': 1.1,
-            'React': 1.0,
-            'Build/Compilation': 1.2,  # Build errors are very specific
-            'Performance': 0.8   # Performance issues are often vague
-        }
+        # Pattern contents -> _PreparedPattern
+        self._prepared: Dict[tuple, _PreparedPattern] = {}
     
     def match_pattern(self, error_message: str, pattern_data: Dict[str, Any],
-                     context: Optional[Dict[str, Any]] = None) -> MatchResult:
+                     context: Optional[Dict[str, Any]] = None,
+                     min_confidence: float = 0.0) -> MatchResult:
         """
         Match an error message against a pattern with detailed scoring.
         
@@ -79,30 +243,193 @@ class PatternMatcher:
             error_message: The error message to match
             pattern_data: Pattern data including regex patterns, keywords, etc.
             context: Optional context information (module, action, etc.)
+            min_confidence: Skip text matching when the pattern can't reach this
+                confidence, returning a zero-confidence result instead
         
         Returns:
             MatchResult with detailed scoring breakdown
         """
-        pattern_id = pattern_data.get('pattern_id', 'unknown')
+        return self.match_patterns(error_message, [pattern_data], context, min_confidence)[0]
+    
+    def match_patterns(self, error_message: str, patterns: List[Dict[str, Any]],
+                       context: Optional[Dict[str, Any]] = None,
+                       min_confidence: float = 0.0) -> List[MatchResult]:
+        """
+        Match an error message against many patterns.
         
-        # Text similarity scoring
-        text_score, matched_patterns = self._calculate_text_similarity(
-            error_message, pattern_data.get('error_patterns', [])
+        Everything that depends only on the error and context is computed
+        once up front instead of once per pattern.
+        
+        Returns:
+            One MatchResult per pattern, in the same order
+        """
+        error = self._prepare_error(error_message, context)
+        return [self._match_prepared(error, pattern_data, min_confidence) for pattern_data in patterns]
+    
+    def _prepare_error(self, error_message: str,
+                       context: Optional[Dict[str, Any]]) -> _ErrorFeatures:
+        """Derive the pattern-independent features of an error and its context."""
+        error_lower = error_message.lower()
+        error_tokens = self._tokenize(error_message)
+        
+        # All text for context matching
+        all_text = error_lower
+        module_lower = None
+        action_score = None
+        if context:
+            all_text += ' ' + ' '.join(str(v).lower() for v in context.values())
+            
+            if 'module' in context:
+                module_lower = context['module'].lower()
+            
+            # Action-based matching
+            if 'action' in context:
+                action = context['action'].lower()
+                if any(act in action for act in ['create', 'add', 'insert']):
+                    if 'validation' in all_text or 'invalid' in all_text:
+                        action_score = 0.7
+                elif any(act in action for act in ['update', 'edit', 'modify']):
+                    if 'permission' in all_text or 'forbidden' in all_text:
+                        action_score = 0.6
+        
+        # Keywords with any synonym present, found in one sweep per error
+        synonym_hits = {
+            keyword for keyword, synonyms in self.synonyms.items()
+            if any(syn in all_text for syn in synonyms)
+        }
+        
+        # Share of each error type's indicators present in the message
+        type_scores = {
+            error_type: sum(1 for ind in indicators if ind in error_lower) / len(indicators)
+            for error_type, indicators in self.type_indicators.items()
+            if indicators
+        }
+        
+        # Check for common error formats
+        format_scores = []
+        # Stack trace format
+        if _STACK_TRACE_RE.search(error_message):
+            format_scores.append(0.3)  # Has stack trace structure
+        # Error code format
+        if _ERROR_CODE_RE.search(error_message):
+            format_scores.append(0.2)  # Has error code format
+        
+        return _ErrorFeatures(
+            message=error_message,
+            lower=error_lower,
+            tokens=error_tokens,
+            token_set=set(error_tokens),
+            all_text=all_text,
+            module_lower=module_lower,
+            action_score=action_score,
+            synonym_hits=synonym_hits,
+            keyword_hits={},
+            type_scores=type_scores,
+            format_scores=format_scores,
+            has_http_status=_HTTP_STATUS_RE.search(error_message) is not None
+        )
+    
+    def _prepare_pattern(self, pattern_data: Dict[str, Any]) -> _PreparedPattern:
+        """Return the derived data for a pattern, cached by the pattern's contents."""
+        error_patterns = pattern_data.get('error_patterns', [])
+        context_keywords = pattern_data.get('context_keywords', [])
+        module_hints = pattern_data.get('module_hints', [])
+        
+        try:
+            key = (pattern_data.get('error_type'), tuple(error_patterns),
+                   tuple(context_keywords), tuple(module_hints))
+            prepared = self._prepared.get(key)
+        except TypeError:
+            # Unhashable contents; prepare without caching
+            key = prepared = None
+        
+        if prepared is None:
+            prepared = self._build_prepared_pattern(
+                pattern_data.get('error_type'), error_patterns, context_keywords, module_hints
+            )
+            if key is not None:
+                if len(self._prepared) >= _PREPARED_CACHE_SIZE:
+                    self._prepared.clear()
+                self._prepared[key] = prepared
+        
+        return prepared
+    
+    def _build_prepared_pattern(self, error_type: Optional[str], error_patterns: List[str],
+                                context_keywords: List[str],
+                                module_hints: List[str]) -> _PreparedPattern:
+        """Compile regexes and extract words and tokens for one pattern."""
+        prepared_patterns = []
+        all_tokens = []
+        for pattern in error_patterns:
+            # Extract key parts from regex pattern for fuzzy matching
+            pattern_words = _find_words(pattern)
+            pattern_text = ' '.join(pattern_words).lower() if pattern_words else None
+            pattern_tokens = self._tokenize(' '.join(pattern_words))
+            all_tokens.extend(pattern_tokens)
+            prepared_patterns.append((
+                pattern,
+                _compile_pattern(pattern, re.IGNORECASE),
+                pattern_text,
+                set(pattern_tokens)
+            ))
+        
+        # Regex hits score 0.9, fuzzy matches at most 0.7, token overlap 0.5
+        if any(compiled for _, compiled, _, _ in prepared_patterns):
+            max_text_score = 0.9
+        elif any(text is not None for _, _, text, _ in prepared_patterns):
+            max_text_score = 0.7
+        else:
+            max_text_score = 0.0
+        
+        return _PreparedPattern(
+            error_type=error_type,
+            error_type_lower=(error_type or '').lower(),
+            error_patterns=prepared_patterns,
+            all_tokens=all_tokens,
+            all_token_set=set(all_tokens),
+            max_text_score=max_text_score,
+            context_keywords=[(keyword, keyword.lower()) for keyword in context_keywords],
+            module_hints_lower=[hint.lower() for hint in module_hints],
+            pattern_words=set(' '.join(error_patterns).lower().split()),
+            keyword_set=set(context_keywords),
+            module_set=set(module_hints)
         )
+    
+    def _match_prepared(self, error: _ErrorFeatures, pattern_data: Dict[str, Any],
+                        min_confidence: float = 0.0) -> MatchResult:
+        """Score one pattern against a prepared error."""
+        pattern_id = pattern_data.get('pattern_id', 'unknown')
+        pattern = self._prepare_pattern(pattern_data)
         
         # Context similarity scoring
-        context_score, matched_keywords = self._calculate_context_similarity(
-            error_message, pattern_data, context
-        )
+        context_score, matched_keywords = self._calculate_context_similarity(error, pattern)
         
         # Structural similarity (error type, category matching)
-        structural_score = self._calculate_structural_similarity(
-            error_message, pattern_data, context
-        )
+        structural_score = self._calculate_structural_similarity(error, pattern)
         
         # Calculate weighted overall confidence
-        error_type = pattern_data.get('error_type', 'Unknown')
-        category_weight = self.category_weights.get(error_type, 1.0)
+        category_weight = self.category_weights.get(pattern.error_type, 1.0)
+        
+        # The cheap scores bound the overall confidence; skip the regex and
+        # fuzzy matching when even a best-case text score falls short
+        if min_confidence > 0:
+            best_case = (
+                pattern.max_text_score * 0.5 + context_score * 0.3 + structural_score * 0.2
+            ) * category_weight
+            if best_case < min_confidence:
+                return MatchResult(
+                    pattern_id=pattern_id,
+                    overall_confidence=0.0,
+                    text_similarity=0.0,
+                    context_similarity=context_score,
+                    structural_similarity=structural_score,
+                    matched_keywords=matched_keywords,
+                    matched_patterns=[],
+                    explanation="Below minimum confidence - text matching skipped"
+                )
+        
+        # Text similarity scoring
+        text_score, matched_patterns = self._calculate_text_similarity(error, pattern)
         
         # Weighted combination of scores
         overall_confidence = (
@@ -128,72 +455,67 @@ class PatternMatcher:
             explanation=explanation
         )
     
-    def _calculate_text_similarity(self, error_message: str, 
-                                 patterns: List[str]) -> Tuple[float, List[str]]:
+    def _calculate_text_similarity(self, error: _ErrorFeatures,
+                                 pattern: _PreparedPattern) -> Tuple[float, List[str]]:
         """Calculate text similarity score using multiple techniques."""
-        error_lower = error_message.lower()
+        error_message = error.message
+        error_lower = error.lower
+        error_tokens = error.tokens
+        error_token_set = error.token_set
         matched_patterns = []
         scores = []
         
-        for pattern in patterns:
+        for source, compiled, pattern_text, pattern_token_set in pattern.error_patterns:
             # Try regex match first (highest confidence)
-            try:
-                if re.search(pattern, error_message, re.IGNORECASE):
-                    matched_patterns.append(pattern)
-                    scores.append(0.9)  # High score for regex match
-                    continue
-            except:
-                pass
+            if compiled and compiled.search(error_message):
+                matched_patterns.append(source)
+                scores.append(0.9)  # High score for regex match
+                continue
             
             # Fuzzy string matching
-            # Extract key parts from regex pattern
-            pattern_words = re.findall(r'[a-zA-Z_]+', pattern)
-            if pattern_words:
-                pattern_text = ' '.join(pattern_words).lower()
-                
-                # Use difflib for sequence matching
-                seq_ratio = difflib.SequenceMatcher(None, pattern_text, error_lower).ratio()
+            if pattern_text is not None:
+                # Token-set similarity (1.0 when either side's words contain the other's)
+                if _token_set_ratio is not None:
+                    seq_ratio = _token_set_ratio(pattern_text, error_lower) / 100.0
+                else:
+                    shortest = min(len(pattern_token_set), len(error_token_set))
+                    seq_ratio = len(pattern_token_set & error_token_set) / shortest if shortest else 0.0
                 scores.append(seq_ratio * 0.7)  # Slightly lower weight for fuzzy match
                 
                 if seq_ratio > 0.6:
-                    matched_patterns.append(f"fuzzy:{pattern}")
+                    matched_patterns.append(f"fuzzy:{source}")
         
         # Also try token-based matching
-        error_tokens = self._tokenize(error_message)
-        pattern_all_tokens = []
-        for pattern in patterns:
-            pattern_all_tokens.extend(self._tokenize(' '.join(re.findall(r'[a-zA-Z_]+', pattern))))
-        
-        if error_tokens and pattern_all_tokens:
-            token_overlap = len(set(error_tokens) & set(pattern_all_tokens))
-            token_score = token_overlap / max(len(error_tokens), len(pattern_all_tokens))
+        if error_tokens and pattern.all_tokens:
+            token_overlap = len(error_token_set & pattern.all_token_set)
+            token_score = token_overlap / max(len(error_tokens), len(pattern.all_tokens))
             scores.append(token_score * 0.5)  # Lower weight for token matching
         
         # Return best score
         return max(scores) if scores else 0.0, matched_patterns
     
-    def _calculate_context_similarity(self, error_message: str,
-                                    pattern_data: Dict[str, Any],
-                                    context: Optional[Dict[str, Any]]) -> Tuple[float, List[str]]:
+    def _calculate_context_similarity(self, error: _ErrorFeatures,
+                                    pattern: _PreparedPattern) -> Tuple[float, List[str]]:
         """Calculate context-based similarity score."""
         matched_keywords = []
         scores = []
-        
-        # Extract all text for matching
-        all_text = error_message.lower()
-        if context:
-            all_text += ' ' + ' '.join(str(v).lower() for v in context.values())
+        all_text = error.all_text
+        keyword_hits = error.keyword_hits
         
         # Check context keywords
-        context_keywords = pattern_data.get('context_keywords', [])
+        context_keywords = pattern.context_keywords
         if context_keywords:
             keyword_matches = 0
-            for keyword in context_keywords:
-                if keyword.lower() in all_text:
+            for keyword, keyword_lower in context_keywords:
+                # Patterns share keywords, so scan the text once per keyword per error
+                hit = keyword_hits.get(keyword_lower)
+                if hit is None:
+                    hit = keyword_hits[keyword_lower] = keyword_lower in all_text
+                if hit:
                     matched_keywords.append(keyword)
                     keyword_matches += 1
                 # Check synonyms
-                elif any(syn in all_text for syn in self.synonyms.get(keyword.lower(), [])):
+                elif keyword_lower in error.synonym_hits:
                     matched_keywords.append(f"syn:{keyword}")
                     keyword_matches += 0.8  # Slightly lower score for synonym
             
@@ -201,76 +523,42 @@ class PatternMatcher:
                 scores.append(keyword_matches / len(context_keywords))
         
         # Check module hints
-        if context and 'module' in context:
-            module_hints = pattern_data.get('module_hints', [])
+        if error.module_lower is not None:
+            module_hints = pattern.module_hints_lower
             if module_hints:
-                module_lower = context['module'].lower()
-                module_matches = sum(1 for hint in module_hints if hint.lower() in module_lower)
+                module_lower = error.module_lower
+                module_matches = sum(1 for hint in module_hints if hint in module_lower)
                 scores.append(module_matches / len(module_hints))
         
         # Check for specific context patterns
-        if context:
-            # Action-based matching
-            if 'action' in context:
-                action = context['action'].lower()
-                if any(act in action for act in ['create', 'add', 'insert']):
-                    if 'validation' in all_text or 'invalid' in all_text:
-                        scores.append(0.7)
-                elif any(act in action for act in ['update', 'edit', 'modify']):
-                    if 'permission' in all_text or 'forbidden' in all_text:
-                        scores.append(0.6)
+        if error.action_score is not None:
+            scores.append(error.action_score)
         
         return max(scores) if scores else 0.0, matched_keywords
     
-    def _calculate_structural_similarity(self, error_message: str,
-                                       pattern_data: Dict[str, Any],
-                                       context: Optional[Dict[str, Any]]) -> float:
+    def _calculate_structural_similarity(self, error: _ErrorFeatures,
+                                       pattern: _PreparedPattern) -> float:
         """Calculate structural similarity based on error characteristics."""
-        scores = []
+        # Error formats (stack trace, error code) don't depend on the pattern
+        scores = list(error.format_scores)
         
         # Check error type indicators in message
-        error_type = pattern_data.get('error_type', '').lower()
-        error_lower = error_message.lower()
-        
-        # Look for type-specific indicators
-        type_indicators = {
-            'database': ['sql', 'table', 'column', 'relation', 'query', 'database'],
-            'api': ['request', 'response', 'endpoint', 'http', '404', '401', '500'],
-            'null reference': ['null', 'undefined', 'cannot read', 'property'],
-            'authentication': ['auth', 'token', 'login', 'credential', 'unauthorized'],
-            'timeout': ['timeout', 'exceeded', 'timed out', 'deadline'],
-            'lambda': ['lambda', 'function', 'aws', 'invoke', 'serverless'],
-            'react': ['react', 'component', 'render', 'hook', 'state'],
-            'file system': ['file', 'directory', 'path', 'permission', 'enoent']
-        }
-        
-        if error_type in type_indicators:
-            indicators = type_indicators[error_type]
-            indicator_count = sum(1 for ind in indicators if ind in error_lower)
-            if indicators:
-                scores.append(indicator_count / len(indicators))
-        
-        # Check for common error formats
-        # Stack trace format
-        if re.search(r'at\s+\w+\s*\(.*:\d+:\d+\)', error_message):
-            scores.append(0.3)  # Has stack trace structure
-        
-        # Error code format
-        if re.search(r'\b[A-Z]+[_-]?[A-Z0-9]+\b', error_message):
-            scores.append(0.2)  # Has error code format
+        error_type = pattern.error_type_lower
+        if error_type in error.type_scores:
+            scores.append(error.type_scores[error_type])
         
         # HTTP status codes
-        if re.search(r'\b[4-5]\d{2}\b', error_message):
-            if error_type == 'api':
-                scores.append(0.5)
+        if error.has_http_status and error_type == 'api':
+            scores.append(0.5)
         
         return max(scores) if scores else 0.0
     
     def _tokenize(self, text: str) -> List[str]:
         """Tokenize text into meaningful words."""
         # Extract words, excluding stop words
-        words = re.findall(r'\b[a-zA-Z_]+\b', text.lower())
-        return [w for w in words if w not in self.stop_words and len(w) > 2]
+        words = _find_tokens(text.lower())
+        stop_words = self.stop_words
+        return [w for w in words if len(w) > 2 and w not in stop_words]
     
     def _generate_match_explanation(self, text_score: float, context_score: float,
                                    structural_score: float, matched_patterns: List[str],
@@ -302,54 +590,56 @@ class PatternMatcher:
     def find_related_patterns(self, patterns: List[Dict[str, Any]], 
                             similarity_threshold: float = 0.6) -> Dict[str, List[str]]:
         """Find related patterns based on similarity."""
-        related = {}
+        prepared = [self._prepare_pattern(pattern) for pattern in patterns]
+        pattern_ids = [pattern.get('pattern_id', f'pattern_{i}') for i, pattern in enumerate(patterns)]
+        related_indexes = [[] for _ in patterns]
+        
+        # Patterns that share nothing score 0, so with a positive threshold only
+        # pairs sharing a word, keyword or module (or error type, when that
+        # alone can reach the threshold) need comparing
+        blocking = similarity_threshold > 0
+        if blocking:
+            use_type = similarity_threshold <= 0.4
+            pattern_keys = [self._blocking_keys(pattern, use_type) for pattern in prepared]
+            index = defaultdict(set)
+            for i, keys in enumerate(pattern_keys):
+                for key in keys:
+                    index[key].add(i)
+        
+        # Column view of the compared fields, for the scoring loop
+        columns = (
+            [pattern.error_type for pattern in prepared],
+            _interned_masks([pattern.pattern_words for pattern in prepared]),
+            _interned_masks([pattern.keyword_set for pattern in prepared]),
+            _interned_masks([pattern.module_set for pattern in prepared])
+        )
         
-        for i, pattern1 in enumerate(patterns):
-            pattern1_id = pattern1.get('pattern_id', f'pattern_{i}')
-            related[pattern1_id] = []
+        # Similarity is symmetric: score each pair once, record it both ways
+        for i in range(len(prepared)):
+            if blocking:
+                candidates = set()
+                for key in pattern_keys[i]:
+                    candidates |= index[key]
+                later = sorted(j for j in candidates if j > i)
+            else:
+                later = range(i + 1, len(prepared))
             
-            for j, pattern2 in enumerate(patterns):
-                if i == j:
-                    continue
-                
-                pattern2_id = pattern2.get('pattern_id', f'pattern_{j}')
-                
-                # Compare patterns
-                similarity = self._calculate_pattern_similarity(pattern1, pattern2)
-                
-                if similarity >= similarity_threshold:
-                    related[pattern1_id].append(pattern2_id)
+            for j in _similar_patterns(i, later, columns, similarity_threshold):
+                related_indexes[i].append(j)
+                related_indexes[j].append(i)
+        
+        # Later patterns with a duplicate ID replace earlier ones
+        related = {}
+        for pattern_id, indexes in zip(pattern_ids, related_indexes):
+            related[pattern_id] = [pattern_ids[j] for j in indexes]
         
         return related
     
-    def _calculate_pattern_similarity(self, pattern1: Dict[str, Any], 
-                                    pattern2: Dict[str, Any]) -> float:
-        """Calculate similarity between two patterns."""
-        scores = []
-        
-        # Same error type gives high similarity
-        if pattern1.get('error_type') == pattern2.get('error_type'):
-            scores.append(0.4)
-        
-        # Compare error patterns
-        patterns1 = set(' '.join(pattern1.get('error_patterns', [])).lower().split())
-        patterns2 = set(' '.join(pattern2.get('error_patterns', [])).lower().split())
-        if patterns1 and patterns2:
-            pattern_overlap = len(patterns1 & patterns2) / len(patterns1 | patterns2)
-            scores.append(pattern_overlap * 0.3)
-        
-        # Compare keywords
-        keywords1 = set(pattern1.get('context_keywords', []))
-        keywords2 = set(pattern2.get('context_keywords', []))
-        if keywords1 and keywords2:
-            keyword_overlap = len(keywords1 & keywords2) / len(keywords1 | keywords2)
-            scores.append(keyword_overlap * 0.2)
-        
-        # Compare modules
-        modules1 = set(pattern1.get('module_hints', []))
-        modules2 = set(pattern2.get('module_hints', []))
-        if modules1 and modules2:
-            module_overlap = len(modules1 & modules2) / len(modules1 | modules2)
-            scores.append(module_overlap * 0.1)
-        
-        return sum(scores)
\ No newline at end of file
+    def _blocking_keys(self, pattern: _PreparedPattern, use_type: bool) -> List[tuple]:
+        """Keys under which two patterns must coincide to have nonzero similarity."""
+        keys = [('word', word) for word in pattern.pattern_words]
+        keys.extend(('keyword', keyword) for keyword in pattern.keyword_set)
+        keys.extend(('module', module) for module in pattern.module_set)
+        if use_type:
+            keys.append(('type', pattern.error_type))
+        return keys
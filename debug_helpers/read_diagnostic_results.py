@@ -4,12 +4,17 @@ Read and display diagnostic results saved by globalDiagnostics.ts
 This script can be used by the explore.md command to automatically include diagnostic results.
 """
 
-import json
+import fnmatch
 import os
 import sys
 from datetime import datetime
 from pathlib import Path
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 def find_latest_diagnostic_file(diagnostic_type='infinite-loop'):
     """Find the most recent diagnostic results file."""
     # Look in Downloads folder (where browser saves files)
@@ -18,15 +23,21 @@ def find_latest_diagnostic_file(diagnostic_type='infinite-loop'):
     # Pattern to match diagnostic files
     pattern = f'diagnostic_results_{diagnostic_type}_*.json'
     
-    # Find all matching files
-    matching_files = list(downloads_path.glob(pattern))
-    
-    if not matching_files:
+    # One directory pass; scandir entries carry their own stat results
+    latest_file = None
+    latest_mtime = None
+    try:
+        with os.scandir(downloads_path) as entries:
+            for entry in entries:
+                if not fnmatch.fnmatchcase(entry.name, pattern) or not entry.is_file():
+                    continue
+                mtime = entry.stat().st_mtime
+                if latest_mtime is None or mtime > latest_mtime:
+                    latest_file, latest_mtime = entry.path, mtime
+    except FileNotFoundError:
         return None
     
-    # Sort by modification time and get the latest
-    latest_file = max(matching_files, key=lambda f: f.stat().st_mtime)
-    return latest_file
+    return Path(latest_file) if latest_file else None
 
 def format_diagnostic_results(data):
     """Format diagnostic results for display."""
@@ -66,10 +77,8 @@ def format_diagnostic_results(data):
     return "\n".join(output)
 
 def save_to_bug_report_section(diagnostic_results):
-    """Create a CDATA section for bug_report.xml"""
-    return f"""<![CDATA[
-{diagnostic_results}
-]]>"""
+    """Create a CDATA section for bug_report.xml from the encoded results"""
+    return b'<![CDATA[\n' + diagnostic_results + b'\n]]>'
 
 def main():
     diagnostic_type = sys.argv[1] if len(sys.argv) > 1 else 'infinite-loop'
@@ -86,8 +95,7 @@ def main():
     
     # Read and parse the file
     try:
-        with open(diagnostic_file, 'r') as f:
-            data = json.load(f)
+        data = _json_loads(diagnostic_file.read_bytes())
         
         # Format the results
         formatted_results = format_diagnostic_results(data)
@@ -99,15 +107,15 @@ def main():
         output_file = Path('debug_artifacts') / f'formatted_{diagnostic_type}_results.txt'
         output_file.parent.mkdir(exist_ok=True)
         
-        with open(output_file, 'w') as f:
-            f.write(formatted_results)
+        # Encode once; the CDATA version wraps the same bytes
+        encoded_results = formatted_results.encode('utf-8')
+        output_file.write_bytes(encoded_results)
         
         print(f"Formatted results saved to: {output_file}")
         
         # Also create CDATA version
         cdata_file = Path('debug_artifacts') / f'{diagnostic_type}_results_cdata.txt'
-        with open(cdata_file, 'w') as f:
-            f.write(save_to_bug_report_section(formatted_results))
+        cdata_file.write_bytes(save_to_bug_report_section(encoded_results))
         
         print(f"CDATA version saved to: {cdata_file}")
         
@@ -4,24 +4,22 @@ Record the bulk delete solution in the failure pattern database
 """
 from failure_pattern_db import FailurePatternDB
 
-# Initialize database
-db = FailurePatternDB()
+SESSION_ID = 'c0e933dc-d401-47f2-9094-10b01f7b99cc'
 
-# Record the pattern and solution
-pattern_id = db.record_pattern(
-    pattern_signature={
-        'error_type': 'UI',
-        'error_message': 'Error toast shown when bulk deleting jobs despite successful deletion',
-        'context_keywords': ['bulk', 'delete', 'jobs', 'toast', 'error', 'single', 'selected'],
-        'module_hints': ['ui', 'recruiter', 'jobs']
-    },
-    solution={
-        'description': 'Use unified deleteJobs API for all bulk deletions instead of special-casing single job',
-        'code_changes': [
-            {
-                'file_path': 'src/pages/recruiter/Jobs.tsx',
-                'description': 'Modified handleDeleteSelectedJobs to always use deleteJobs() API',
-                'diff_snippet': '''- if (jobToDelete.id.includes(',')) {
+PATTERN_SIGNATURE = {
+    'error_type': 'UI',
+    'error_message': 'Error toast shown when bulk deleting jobs despite successful deletion',
+    'context_keywords': ['bulk', 'delete', 'jobs', 'toast', 'error', 'single', 'selected'],
+    'module_hints': ['ui', 'recruiter', 'jobs']
+}
+
+SOLUTION = {
+    'description': 'Use unified deleteJobs API for all bulk deletions instead of special-casing single job',
+    'code_changes': [
+        {
+            'file_path': 'src/pages/recruiter/Jobs.tsx',
+            'description': 'Modified handleDeleteSelectedJobs to always use deleteJobs() API',
+            'diff_snippet': '''- if (jobToDelete.id.includes(',')) {
 -   const jobIds = jobToDelete.id.split(',');
 -   // ... bulk delete logic
 - } else {
@@ -31,15 +29,38 @@ pattern_id = db.record_pattern(
 + // Always use bulk delete API, even for single job
 + const jobIds = jobToDelete.id.includes(',') ? jobToDelete.id.split(',') : [jobToDelete.id];
 + // ... unified delete logic using deleteJobs(jobIds)'''
-            }
-        ],
-        'test_cases': ['test_bulk_job_deletion_fix']
-    },
-    session_id='c0e933dc-d401-47f2-9094-10b01f7b99cc'
-)
+        }
+    ],
+    'test_cases': ['test_bulk_job_deletion_fix']
+}
+
+
+def main():
+    # Initialize database
+    db = FailurePatternDB()
+    
+    # Pattern IDs are a stable hash of the error type and message, so a
+    # previous run of this script can be looked up directly
+    pattern_id = db.generate_pattern_id(PATTERN_SIGNATURE['error_type'],
+                                        PATTERN_SIGNATURE['error_message'])
+    pattern = db.patterns.get(pattern_id)
+    if pattern and any(s.description == SOLUTION['description'] for s in pattern.solutions):
+        print(f" Solution already recorded with pattern ID: {pattern_id}")
+        return
+    
+    # Record the pattern and solution
+    pattern_id = db.record_pattern(
+        pattern_signature=PATTERN_SIGNATURE,
+        solution=SOLUTION,
+        session_id=SESSION_ID
+    )
+    
+    # Mark the solution as successful
+    db.record_solution_result(pattern_id, 0, True, SESSION_ID)
+    
+    print(f" Solution recorded with pattern ID: {pattern_id}")
+    print(" This solution can help future developers facing similar bulk delete issues!")
 
-# Mark the solution as successful
-db.record_solution_result(pattern_id, 0, True, 'c0e933dc-d401-47f2-9094-10b01f7b99cc')
 
-print(f" Solution recorded with pattern ID: {pattern_id}")
-print(" This solution can help future developers facing similar bulk delete issues!")
\ No newline at end of file
+if __name__ == '__main__':
+    main()
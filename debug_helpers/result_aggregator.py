@@ -35,8 +35,23 @@ class ResultAggregator:
         self.report_generator = ReportGenerator()
         
     def add_result(self, worker_result: Dict[str, Any]):
-        """Add a worker result to the aggregator."""
+        """Add a worker result and fold it into the running statistics."""
+        worker_result = self._normalize_result(worker_result)
+        self._accumulate_basic_stats(worker_result)
         self.worker_results.append(worker_result)
+    
+    @staticmethod
+    def _normalize_result(worker_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill in the fields the statistics and analyzers index directly."""
+        # A malformed result counts as a failure instead of breaking collection
+        duration = worker_result.get('duration', 0)
+        return {
+            **worker_result,
+            'scenario_name': worker_result.get('scenario_name', 'unknown'),
+            'worker_id': worker_result.get('worker_id'),
+            'success': worker_result.get('success', False),
+            'duration': duration if isinstance(duration, (int, float)) else 0
+        }
         
     def aggregate(self) -> AggregatedResults:
         """Aggregate all worker results and identify patterns."""
@@ -66,38 +81,44 @@ class ResultAggregator:
         
         return self.aggregated_results
     
+    def _accumulate_basic_stats(self, worker_result: Dict[str, Any]):
+        """Update running counts and duration statistics with one result."""
+        results = self.aggregated_results
+        get = worker_result.get
+        scenario_name = worker_result['scenario_name']
+        success = worker_result['success']
+        duration = worker_result['duration']
+        
+        # Success/failure counts
+        if success:
+            results.successful_scenarios += 1
+        else:
+            results.failed_scenarios += 1
+        
+        # Duration statistics
+        if duration:
+            results.total_duration += duration
+            if duration < results.min_duration:
+                results.min_duration = duration
+            if duration > results.max_duration:
+                results.max_duration = duration
+        
+        # Store individual results
+        results.scenario_results[scenario_name] = {
+            'success': success,
+            'duration': duration,
+            'error': get('error'),
+            'worker_id': worker_result['worker_id'],
+            'session_id': get('session_id'),
+            'checkpoints': get('checkpoints', []),
+            'artifacts': get('artifacts', [])
+        }
+    
     def _calculate_basic_stats(self):
-        """Calculate basic statistics from results."""
+        """Derive totals, rates and averages from the running statistics."""
         results = self.aggregated_results
         results.total_scenarios = len(self.worker_results)
         
-        for worker_result in self.worker_results:
-            scenario_name = worker_result['scenario_name']
-            
-            # Success/failure counts
-            if worker_result['success']:
-                results.successful_scenarios += 1
-            else:
-                results.failed_scenarios += 1
-            
-            # Duration statistics
-            duration = worker_result.get('duration', 0)
-            if duration:
-                results.total_duration += duration
-                results.min_duration = min(results.min_duration, duration)
-                results.max_duration = max(results.max_duration, duration)
-            
-            # Store individual results
-            results.scenario_results[scenario_name] = {
-                'success': worker_result['success'],
-                'duration': duration,
-                'error': worker_result.get('error'),
-                'worker_id': worker_result['worker_id'],
-                'session_id': worker_result.get('session_id'),
-                'checkpoints': worker_result.get('checkpoints', []),
-                'artifacts': worker_result.get('artifacts', [])
-            }
-        
         # Calculate rates and averages
         if results.total_scenarios > 0:
             results.success_rate = results.successful_scenarios / results.total_scenarios
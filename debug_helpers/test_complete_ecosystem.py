@@ -4,14 +4,20 @@ Comprehensive test of the complete debugging ecosystem.
 Tests that all components work together seamlessly.
 """
 
+import io
 import os
 import sys
 import json
 import asyncio
 import tempfile
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, redirect_stdout
+from contextvars import ContextVar
 from pathlib import Path
 from datetime import datetime
+from typing import Awaitable, Callable, Iterator, Optional
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -23,6 +29,62 @@ from debug_helpers.parallel_debugger import ParallelDebugger
 from debug_helpers.parallel_config import TestScenario, TestType, ParallelDebugConfig
 from tests.test_manager import TestManager
 
+# In-memory filesystem for test scratch files, when the platform has one
+SHM_DIR = '/dev/shm'
+
+# Fixture file contents, shared by every run
+SERVER_LOG = """
+[2024-01-01 10:00:00] INFO: Server started
+[2024-01-01 10:00:05] ERROR: Database connection failed
+[2024-01-01 10:00:10] ERROR: relation "users" does not exist
+[2024-01-01 10:00:15] WARNING: API timeout exceeded
+[2024-01-01 10:00:20] ERROR: 401 Unauthorized
+"""
+
+DEBUG_LOG = """
+[DEBUG-TEST123-API-ERROR] 401 Unauthorized: Invalid token
+[DEBUG-TEST123-DB-ERROR] relation "users" does not exist
+[DEBUG-TEST123-API-ERROR] 401 Unauthorized: Token expired
+[DEBUG-TEST123-UI-ERROR] TypeError: Cannot read property 'map' of null
+[DEBUG-TEST123-DB-ERROR] duplicate key value violates unique constraint
+"""
+
+SAMPLE_TEST_SOURCE = '''#!/usr/bin/env python3
+"""Test API validation.
+
+@purpose: Validate API endpoints
+@scenarios: api-validation, error-handling
+@tags: api, validation
+"""
+
+def test_api_validation():
+    """Test API validation logic."""
+    assert True  # Placeholder
+'''
+
+SIMPLE_TEST_SCRIPT = '''
+import sys
+print("Test executed")
+sys.exit(0)
+'''
+
+# Output buffer of the test running in the current thread or task
+_test_output: ContextVar[Optional[io.StringIO]] = ContextVar('_test_output', default=None)
+
+
+class _TestOutputRouter:
+    """stdout stand-in that sends a running test's prints to its own buffer."""
+    
+    def __init__(self, stream):
+        self.stream = stream
+    
+    def write(self, text: str) -> int:
+        buffer = _test_output.get()
+        return (self.stream if buffer is None else buffer).write(text)
+    
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
 
 class TestCompleteEcosystem:
     """Test the complete debugging ecosystem integration."""
@@ -31,10 +93,13 @@ class TestCompleteEcosystem:
         self.passed_tests = []
         self.failed_tests = []
         self.temp_dir = None
+        self._results_lock = threading.Lock()
         
     def setup(self):
         """Set up test environment."""
-        self.temp_dir = Path(tempfile.mkdtemp())
+        # Keep scratch files on tmpfs where there is one (Linux), else the default temp dir
+        scratch_root = SHM_DIR if os.path.isdir(SHM_DIR) and os.access(SHM_DIR, os.W_OK) else None
+        self.temp_dir = Path(tempfile.mkdtemp(dir=scratch_root))
         
         # Create test directories
         (self.temp_dir / 'logs').mkdir()
@@ -42,31 +107,73 @@ class TestCompleteEcosystem:
         (self.temp_dir / 'tests' / 'integration' / 'workflows').mkdir(parents=True)
         
         # Create sample log file
-        log_content = """
-[2024-01-01 10:00:00] INFO: Server started
-[2024-01-01 10:00:05] ERROR: Database connection failed
-[2024-01-01 10:00:10] ERROR: relation "users" does not exist
-[2024-01-01 10:00:15] WARNING: API timeout exceeded
-[2024-01-01 10:00:20] ERROR: 401 Unauthorized
-"""
-        (self.temp_dir / 'logs' / 'server.log').write_text(log_content)
+        (self.temp_dir / 'logs' / 'server.log').write_text(SERVER_LOG)
         
     def teardown(self):
         """Clean up test environment."""
         if self.temp_dir and self.temp_dir.exists():
             shutil.rmtree(self.temp_dir)
     
-    def run_test(self, test_name: str, test_func):
+    def run_test(self, test_name: str, test_func: Callable[[], None]) -> None:
         """Run a single test and track results."""
+        with self._buffered_output():
+            try:
+                print(f"\n Running: {test_name}")
+                test_func()
+                self._record_pass(test_name)
+            except Exception as e:
+                self._record_failure(test_name, e)
+    
+    async def run_async_test(self, test_name: str, test_func: Callable[[], Awaitable[None]]) -> None:
+        """Run a single async test and track results."""
+        with self._buffered_output():
+            try:
+                print(f"\n Running: {test_name}")
+                await test_func()
+                self._record_pass(test_name)
+            except Exception as e:
+                self._record_failure(test_name, e)
+    
+    @contextmanager
+    def _buffered_output(self) -> Iterator[None]:
+        """Buffer what a test prints and show it in one piece when the test ends."""
+        output = io.StringIO()
+        token = _test_output.set(output)
         try:
-            print(f"\n Running: {test_name}")
-            test_func()
+            yield
+        finally:
+            _test_output.reset(token)
+            with self._results_lock:
+                sys.stdout.write(output.getvalue())
+                sys.stdout.flush()
+    
+    def _record_pass(self, test_name: str) -> None:
+        """Record a passed test; tests may finish on several threads at once."""
+        with self._results_lock:
             print(f" PASSED: {test_name}")
             self.passed_tests.append(test_name)
-        except Exception as e:
+    
+    def _record_failure(self, test_name: str, error: Exception) -> None:
+        """Record a failed test with its error."""
+        with self._results_lock:
             print(f" FAILED: {test_name}")
-            print(f"   Error: {str(e)}")
-            self.failed_tests.append((test_name, str(e)))
+            print(f"   Error: {str(error)}")
+            self.failed_tests.append((test_name, str(error)))
+    
+    async def _run_tests_concurrently(self, test_methods):
+        """Run independent tests side by side; they write to disjoint paths."""
+        loop = asyncio.get_running_loop()
+        # Each test's output is buffered and printed whole, so it isn't interleaved
+        with ThreadPoolExecutor(max_workers=len(test_methods)) as pool, \
+                redirect_stdout(_TestOutputRouter(sys.stdout)):
+            # Async tests run on this loop, in the main thread, since
+            # ParallelDebugger installs signal handlers
+            await asyncio.gather(*[
+                self.run_async_test(test_name, test_func)
+                if asyncio.iscoroutinefunction(test_func)
+                else loop.run_in_executor(pool, self.run_test, test_name, test_func)
+                for test_name, test_func in test_methods
+            ])
     
     def test_session_creation_and_persistence(self):
         """Test creating a debug session with state persistence."""
@@ -130,20 +237,8 @@ class TestCompleteEcosystem:
         manager = TestManager(base_path=self.temp_dir / 'tests')
         
         # Create a sample test file
-        test_content = '''#!/usr/bin/env python3
-"""Test API validation.
-
-@purpose: Validate API endpoints
-@scenarios: api-validation, error-handling
-@tags: api, validation
-"""
-
-def test_api_validation():
-    """Test API validation logic."""
-    assert True  # Placeholder
-'''
         test_file = self.temp_dir / 'tests' / 'unit' / 'api' / 'test_api_validation.py'
-        test_file.write_text(test_content)
+        test_file.write_text(SAMPLE_TEST_SOURCE)
         
         # Discover tests
         tests = manager.discover_tests()
@@ -182,11 +277,7 @@ def test_api_validation():
         """Test basic parallel debugging functionality."""
         # Create simple test script
         test_script = self.temp_dir / 'test_simple.py'
-        test_script.write_text('''
-import sys
-print("Test executed")
-sys.exit(0)
-''')
+        test_script.write_text(SIMPLE_TEST_SCRIPT)
         
         # Create scenarios
         scenarios = [
@@ -211,14 +302,16 @@ sys.exit(0)
         
         # Mock execution for testing
         async def mock_execute(scenarios):
+            # Mocked scenarios take no real time; read the clock once for all of them
+            timestamp = datetime.now().isoformat()
             for i, scenario in enumerate(scenarios):
                 result = {
                     'worker_id': f'worker_{i}',
                     'scenario_name': scenario.name,
                     'success': True,
                     'duration': 1.0,
-                    'start_time': datetime.now().isoformat(),
-                    'end_time': datetime.now().isoformat(),
+                    'start_time': timestamp,
+                    'end_time': timestamp,
                     'logs': ['Test executed'],
                     'findings': [],
                     'metrics': {}
@@ -311,13 +404,7 @@ sys.exit(0)
     def test_error_pattern_detection(self):
         """Test error pattern detection across components."""
         # Create logs with patterns
-        error_log = """
-[DEBUG-TEST123-API-ERROR] 401 Unauthorized: Invalid token
-[DEBUG-TEST123-DB-ERROR] relation "users" does not exist
-[DEBUG-TEST123-API-ERROR] 401 Unauthorized: Token expired
-[DEBUG-TEST123-UI-ERROR] TypeError: Cannot read property 'map' of null
-[DEBUG-TEST123-DB-ERROR] duplicate key value violates unique constraint
-"""
+        error_log = DEBUG_LOG
         log_file = self.temp_dir / 'logs' / 'debug.log'
         log_file.write_text(error_log)
         
@@ -329,16 +416,17 @@ sys.exit(0)
         assert len(findings) > 0, "No patterns detected"
         
         # Check that we found specific error patterns in the logs
-        log_content_lower = error_log.lower()
-        assert '401 unauthorized' in log_content_lower, "Auth errors not in logs"
-        assert 'relation' in log_content_lower and 'does not exist' in log_content_lower, "DB errors not in logs"
-        assert 'cannot read property' in log_content_lower, "Null reference not in logs"
+        # Lowercase the log once and search its bytes
+        log_bytes = error_log.encode().lower()
+        assert b'401 unauthorized' in log_bytes, "Auth errors not in logs"
+        assert b'relation' in log_bytes and b'does not exist' in log_bytes, "DB errors not in logs"
+        assert b'cannot read property' in log_bytes, "Null reference not in logs"
         
         # Verify analyzer detected these patterns
         assert analyzer.error_counts, "No error counts recorded"
         assert sum(analyzer.error_counts.values()) > 0, "No errors counted"
     
-    def run_all_tests(self):
+    def run_all_tests(self) -> bool:
         """Run all ecosystem tests."""
         print("\n" + "="*60)
         print(" TESTING COMPLETE DEBUGGING ECOSYSTEM")
@@ -351,13 +439,12 @@ sys.exit(0)
             ("Session Creation and Persistence", self.test_session_creation_and_persistence),
             ("Log Analysis Integration", self.test_log_analysis_integration),
             ("Test Discovery and Enrichment", self.test_test_discovery_and_enrichment),
-            ("Parallel Execution Basics", lambda: asyncio.run(self.test_parallel_execution_basics())),
+            ("Parallel Execution Basics", self.test_parallel_execution_basics),
             ("Integration Workflow", self.test_integration_workflow),
             ("Error Pattern Detection", self.test_error_pattern_detection),
         ]
         
-        for test_name, test_func in test_methods:
-            self.run_test(test_name, test_func)
+        asyncio.run(self._run_tests_concurrently(test_methods))
         
         self.teardown()
         
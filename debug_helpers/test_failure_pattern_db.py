@@ -231,6 +231,19 @@ class TestFailurePatternDB:
         
         assert result.context_similarity > 0.5, "Low context similarity"
         assert 'migration' in result.matched_keywords, "Keyword not matched"
+        
+        # Test minimum confidence prefilter
+        result = matcher.match_pattern('Button is blue', pattern_data, min_confidence=0.8)
+        
+        assert result.overall_confidence == 0.0, "Unreachable match not skipped"
+        
+        result = matcher.match_pattern(
+            'ERROR: relation "users" does not exist',
+            pattern_data,
+            min_confidence=0.3
+        )
+        
+        assert 'relation.*does not exist' in result.matched_patterns, "Reachable match skipped"
     
     def test_pattern_importer(self):
         """Test importing patterns from various sources."""
@@ -271,8 +284,12 @@ class TestFailurePatternDB:
         db = FailurePatternDB(self.temp_dir / 'imported_patterns.json')
         importer = PatternImporter(db)
         
-        importer.import_from_error_patterns(patterns_file)
-        importer.import_from_sessions(sessions_dir)
+        # Writes are deferred inside the batch and saved once on exit
+        with importer.batch():
+            importer.import_from_error_patterns(patterns_file)
+            importer.import_from_sessions(sessions_dir)
+            assert not db.db_path.exists(), "Database saved before batch ended"
+        assert db.db_path.exists(), "Database not saved after batch"
         
         # Verify imports
         assert importer.import_stats['patterns_imported'] > 0, "No patterns imported"
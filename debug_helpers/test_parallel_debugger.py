@@ -395,7 +395,8 @@ raise Exception("Intentional test failure")
         
         # Test double allocation
         config.release_ports("worker1")
-        config.allocate_ports("worker1")
+        reused_ports = config.allocate_ports("worker1")
+        assert reused_ports == worker1_ports, "Released ports should be reused"
         try:
             config.allocate_ports("worker1")
             assert False, "Should not allow double allocation"
@@ -409,6 +410,14 @@ raise Exception("Intentional test failure")
         ]
         warnings = config.validate_configuration()
         assert any("Duplicate scenario names" in w for w in warnings), "Should warn about duplicates"
+        
+        # Duplicates are also tracked when scenarios are added incrementally
+        config = ParallelDebugConfig()
+        config.add_scenario(TestScenario(name="dup", test_type=TestType.UI_FLOW, test_function="test"))
+        assert config.validate_configuration() == [], "Single scenario should not warn"
+        config.add_scenarios([TestScenario(name="dup", test_type=TestType.API_TEST, test_function="test")])
+        warnings = config.validate_configuration()
+        assert any("Duplicate scenario names" in w for w in warnings), "Should warn about added duplicate"
     
     def test_aggregator_pattern_detection(self):
         """Test pattern detection in result aggregator."""